@@ -12,7 +12,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ab_cli.core.config import get_language
 from ab_cli.core.llm_settings import add_llm_request_arguments
@@ -134,19 +134,33 @@ def get_system_context() -> str:
     return '\n'.join(context_parts)
 
 
-def get_directory_listing(path: str = '.') -> str:
-    """Get directory listing."""
+def get_directory_listing(path: str = '.', max_chars: int = 1500) -> str:
+    """Get directory listing, one entry name per line.
+
+    Stops scanning once ``max_chars`` would be exceeded, so very large
+    directories cost no more than small ones. Directories get a trailing
+    slash (resolved from the dirent type, without an extra stat).
+    """
     try:
-        result = subprocess.run(
-            ['ls', '-la', path],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout[:1500]  # Limit size
-    except subprocess.CalledProcessError:
+        entries = os.scandir(path)
+    except OSError:
         return ""
 
+    lines = []
+    total = 0
+    with entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            line = f"{entry.name}/\n" if is_dir else f"{entry.name}\n"
+            total += len(line)
+            if total > max_chars:
+                break
+            lines.append(line)
+    return ''.join(lines)
+
 
 def get_shebang(lang: str) -> str:
     """Get the appropriate shebang for the language."""
@@ -288,8 +302,8 @@ Return ONLY the command:"""
         return ""
 
 
-@handle_cli_errors
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the gen-script argument parser."""
     parser = argparse.ArgumentParser(
         description='Generate scripts from natural language descriptions',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -343,7 +357,17 @@ Examples:
     )
     add_llm_request_arguments(parser)
 
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import; argparse parsers are not mutated by parse_args().
+_PARSER = _build_parser()
+
+
+@handle_cli_errors
+def main(argv: Optional[List[str]] = None):
+    parser = _PARSER
+    args = parser.parse_args(argv)
 
     # Get language from config if not specified
     output_lang = args.output_lang or get_language('gen-script')
@@ -13,7 +13,6 @@ Usage:
 """
 import argparse
 import json
-import os
 import sys
 from typing import Any, Dict, List, Optional
 
@@ -281,7 +280,7 @@ def cmd_list(args) -> None:
     config = get_config()
     api_base = config.get_with_default('global.api_base')
     api_key_env = config.get_with_default('global.api_key_env')
-    api_key = os.getenv(api_key_env)
+    api_key = config.get_api_key(api_key_env)
 
     if not api_key:
         log_error(f"Environment variable {api_key_env} is not set.")
@@ -311,7 +310,7 @@ def cmd_info(args) -> None:
     config = get_config()
     api_base = config.get_with_default('global.api_base')
     api_key_env = config.get_with_default('global.api_key_env')
-    api_key = os.getenv(api_key_env)
+    api_key = config.get_api_key(api_key_env)
 
     if not api_key:
         log_error(f"Environment variable {api_key_env} is not set.")
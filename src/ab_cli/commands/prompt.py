@@ -24,25 +24,30 @@ Flag `--set-default-model <model>` to **persist** the default model.
 import argparse
 import datetime
 import json
-import os
 import pathlib
-import re
-import subprocess
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict
 
 import pyperclip
-import requests
-from binaryornot.check import is_binary
-import pathspec
 
 from ab_cli.core.config import get_config
 from ab_cli.core.llm_settings import add_llm_request_arguments
 from ab_cli.utils.error_handling import handle_cli_errors
 from ab_cli.utils.api import (
     set_verbose as set_api_verbose,
+    build_specialist_prefix,
     pp,
+    send_to_openrouter,
 )
+from ab_cli.utils.file_processing import (
+    find_aiignore_files,
+    is_binary_file,
+    load_aiignore_spec,
+    process_file,
+    process_files,
+    should_ignore_path,
+)
+from ab_cli.utils.history import sanitize_sensitive_data
 
 # Re-export for backward compatibility (tests import these from prompt.py)
 __all__ = [
@@ -96,197 +101,11 @@ def persist_default_model(new_model: str) -> bool:
         pp(f"Error persisting default model: {e}")
         return False
 
-# =========================
-# Providers
-# =========================
-
-def build_specialist_prefix(specialist: Optional[str]) -> str:
-    specialist_prompts = {
-        'dev': 'Act as a senior programmer specialized in software development, with over 20 years of experience. Your responses should be clear, efficient, well-structured and follow industry best practices. Think step by step.',
-        'rm': 'Act as a senior Retail Media analyst, specialized in digital advertising strategies for e-commerce and marketplaces. Your knowledge covers platforms like Amazon Ads, Mercado Ads and Criteo. Your responses should be analytical, strategic and data-driven.'
-    }
-    return specialist_prompts.get(specialist or "", "")
-
-
-def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optional[str],
-                        model_name: str, timeout_s: int, max_completion_tokens: int = 256,
-                        reasoning_effort: Optional[str] = None,
-                        service_tier: Optional[str] = None,
-                        api_key_env: str = "OPENROUTER_API_KEY",
-                        api_base: str = "https://openrouter.ai/api/v1") -> Optional[Dict[str, Any]]:
-    """
-    Sends the prompt and context to the OpenRouter API (OpenAI compatible).
-    """
-    api_key = os.getenv(api_key_env)
-    if not api_key:
-        # Always print error to stderr, regardless of VERBOSE
-        print(f"Error: The environment variable {api_key_env} is not defined.", file=sys.stderr)
-        return None
-
-    # Build full prompt
-    parts = []
-    specialist_prefix = build_specialist_prefix(specialist)
-    if specialist_prefix:
-        parts.append(specialist_prefix)
-
-    parts.append(prompt)
-
-    if context.strip():
-        parts.append("\n--- FILE CONTEXT ---\n" + context)
-
-    parts.append(f"--- OUTPUT INSTRUCTION ---\nRespond strictly in language: {lang}.")
-
-    full_prompt = "\n\n".join(parts)
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
-    url = f"{api_base.rstrip('/')}/chat/completions"
-
-    messages = [{"role": "user", "content": full_prompt}]
-    if specialist_prefix:
-        messages.insert(0, {"role": "system", "content": specialist_prefix})
-
-    payload = {
-        "model": model_name,
-        "messages": messages,
-    }
-
-    if reasoning_effort:
-        payload["reasoning"] = {"effort": reasoning_effort}
-
-    if service_tier and service_tier != "default":
-        payload["service_tier"] = service_tier
-
-    if max_completion_tokens > 0:
-        payload["max_tokens"] = max_completion_tokens
-
-    try:
-        pp(f"Sending request to OpenRouter ({model_name})...")
-        response = requests.post(url, headers=headers, json=payload, timeout=timeout_s)
-        response.raise_for_status()
-        data = response.json()
-
-        message = data['choices'][0]['message']
-        text_response = message.get('content') or ''
-
-        # Handle reasoning models (gpt-5, o1, o3, etc.) that put response in reasoning field
-        if not text_response and 'reasoning' in message:
-            # For simple tasks, try to extract the final answer from reasoning
-            reasoning = message.get('reasoning', '')
-            # If the model ran out of tokens, reasoning might contain a partial answer
-            if reasoning:
-                pp(f"Note: Using reasoning field (model: {model_name}, content was empty)")
-                text_response = reasoning
-
-        usage = data.get("usage", {})
-        prompt_tokens = usage.get("prompt_tokens", "N/A")
-        response_tokens = usage.get("completion_tokens", "N/A")
-
-        return {
-            "provider": "openrouter",
-            "model": model_name,
-            "text": text_response,
-            "prompt_tokens": prompt_tokens,
-            "response_tokens": response_tokens,
-            "full_prompt": full_prompt,
-        }
-
-    except requests.exceptions.RequestException as e:
-        # Always print errors to stderr regardless of VERBOSE mode
-        print(f"Network or HTTP error calling OpenRouter: {e}", file=sys.stderr)
-        if getattr(e, 'response', None) is not None:
-            try:
-                print(f"Error details: {e.response.text}", file=sys.stderr)
-            except Exception:
-                pass
-        return None
-    except (KeyError, IndexError) as e:
-        print(f"Error extracting content from response: {e}", file=sys.stderr)
-        try:
-            print(f"Response structure received: {response.json()}", file=sys.stderr)
-        except Exception:
-            pass
-        return None
-    except Exception as e:
-        print(f"Unexpected error: {e}", file=sys.stderr)
-        return None
-
-
 # =========================
 # History and Persistence
 # =========================
 
 
-def sanitize_sensitive_data(text: str) -> str:
-    """
-    Sanitize sensitive data from text before saving to history.
-
-    Patterns sanitized:
-    - API keys (various formats including custom X_API_KEY patterns)
-    - Passwords and secrets
-    - Tokens and credentials (OAuth, Bearer, access tokens)
-    - Webhook URLs
-    - Private keys (PEM format)
-    - Generic secret patterns
-
-    Args:
-        text: The text to sanitize
-
-    Returns:
-        Text with sensitive data replaced with [REDACTED] placeholders
-    """
-    if not text:
-        return text
-
-    # Patterns to sanitize (key=value format)
-    patterns = [
-        # API keys - specific patterns
-        (r'(api[_-]?key\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]'),
-        (r'(OPENROUTER_API_KEY\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]'),
-        # OpenAI-style sk- API keys (allow hyphens in key value)
-        (r'(sk-[a-zA-Z0-9-]{20,})', '[REDACTED_API_KEY]'),
-        # Custom API keys (e.g., STRIPE_API_KEY=xxx, GITHUB_API_KEY=xxx)
-        (r'([A-Z_]+_API_KEY\s*[=:]\s*)\S+', r'\1[REDACTED]'),
-        # Passwords
-        (r'(password\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(passwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(pwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        # Tokens and secrets
-        (r'(secret\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(token\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(auth\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        # OAuth and access tokens
-        (r'(oauth_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(access_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
-        # Bearer tokens (comprehensive pattern including base64 chars)
-        (r'(Bearer\s+)[A-Za-z0-9\-._~+/]+=*', r'\1[REDACTED]'),
-        # Basic auth
-        (r'(Basic\s+)[a-zA-Z0-9+/=]{20,}', r'\1[REDACTED]'),
-        # Webhook URLs (sanitize entire URL - matches "webhook" or "hooks" in URL)
-        (r'https?://[^\s]*(webhook|hooks)[^\s]*', '[REDACTED_WEBHOOK_URL]', re.IGNORECASE),
-        # Private keys (PEM format)
-        (r'-----BEGIN[A-Z\s]*PRIVATE KEY-----[\s\S]*?-----END[A-Z\s]*PRIVATE KEY-----',
-         '[REDACTED_PRIVATE_KEY]'),
-        # Generic secrets pattern (SECRET, PASSWORD, TOKEN, KEY, CREDENTIAL in env vars)
-        (r'([A-Z_]*(SECRET|PASSWORD|TOKEN|KEY|CREDENTIAL)[A-Z_]*\s*[=:]\s*)\S+',
-         r'\1[REDACTED]'),
-    ]
-
-    result = text
-    for pattern_tuple in patterns:
-        if len(pattern_tuple) == 3:
-            pattern, replacement, flags = pattern_tuple
-            result = re.sub(pattern, replacement, result, flags=flags)
-        else:
-            pattern, replacement = pattern_tuple
-            result = re.sub(pattern, replacement, result)
-
-    return result
-
-
 def save_to_history(full_prompt: str, response_text: str, result: Dict[str, Any],
                      files_info: Dict[str, Any], args: argparse.Namespace) -> None:
     """
@@ -521,183 +340,6 @@ def cleanup_old_history(history_dir: pathlib.Path, keep_last: int = 100) -> None
 
 
 # =========================
-# Binary Detection
-# =========================
-
-def is_binary_file(file_path: pathlib.Path) -> bool:
-    """
-    Detect if a file is binary using the binaryornot library.
-
-    Args:
-        file_path: Path of the file to check.
-
-    Returns:
-        True if the file is binary, False if it's text.
-    """
-    try:
-        return is_binary(str(file_path))
-    except Exception:
-        return True  # If can't read, assume binary
-
-
-# =========================
-# .aiignore Support
-# =========================
-
-def find_git_root(start_path: pathlib.Path) -> Optional[pathlib.Path]:
-    """
-    Find the git repository root from the starting path.
-
-    Args:
-        start_path: Starting path for search.
-
-    Returns:
-        Git root path or None if not in a repository.
-    """
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--show-toplevel'],
-            capture_output=True, text=True, cwd=str(start_path)
-        )
-        if result.returncode == 0:
-            return pathlib.Path(result.stdout.strip())
-    except Exception:
-        pass
-    return None
-
-
-def find_aiignore_files(start_path: pathlib.Path) -> List[pathlib.Path]:
-    """
-    Search for .aiignore files from starting directory to git root.
-
-    Args:
-        start_path: Starting path for search.
-
-    Returns:
-        List of .aiignore file paths found (from most specific to most general).
-    """
-    aiignore_files = []
-    current = start_path.resolve()
-    git_root = find_git_root(current)
-
-    while current != current.parent:
-        aiignore_path = current / '.aiignore'
-        if aiignore_path.exists() and aiignore_path.is_file():
-            aiignore_files.append(aiignore_path)
-
-        # Stop at git root if found
-        if git_root and current == git_root:
-            break
-
-        current = current.parent
-
-    return aiignore_files
-
-
-def load_aiignore_spec(aiignore_files: List[pathlib.Path]) -> Optional[pathspec.GitIgnoreSpec]:
-    """
-    Load and combine patterns from multiple .aiignore files.
-
-    Args:
-        aiignore_files: List of .aiignore paths (from most specific to most general).
-
-    Returns:
-        Combined spec or None if no patterns.
-    """
-    all_patterns = []
-
-    # Process from most general (root) to most specific
-    for aiignore_path in reversed(aiignore_files):
-        try:
-            with open(aiignore_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            all_patterns.extend(lines)
-        except Exception as e:
-            pp(f"Warning: Error reading {aiignore_path}: {e}")
-
-    if not all_patterns:
-        return None
-
-    return pathspec.GitIgnoreSpec.from_lines(all_patterns)
-
-
-def should_ignore_path(
-    file_path: pathlib.Path,
-    spec: Optional[pathspec.GitIgnoreSpec],
-    base_path: pathlib.Path
-) -> bool:
-    """
-    Check if a file should be ignored based on .aiignore patterns.
-
-    Args:
-        file_path: Absolute path of the file.
-        spec: Compiled GitIgnore spec (or None).
-        base_path: Base path for relative path calculation.
-
-    Returns:
-        True if the file should be ignored.
-    """
-    if spec is None:
-        return False
-
-    try:
-        rel_path = file_path.relative_to(base_path)
-        return spec.match_file(str(rel_path))
-    except ValueError:
-        # file_path is not relative to base_path
-        return spec.match_file(str(file_path))
-
-
-# =========================
-# File Processing
-# =========================
-
-def process_file(file_path: pathlib.Path, path_format: str, max_tokens_doc: int) -> Tuple[str, int, int]:
-    """
-    Read file content, format header and truncate if necessary based on tokens.
-
-    Args:
-        file_path: Path of the file to process.
-        path_format: How the path should be formatted ('full', 'relative', 'name_only').
-        max_tokens_doc: Maximum estimated tokens for this file.
-
-    Returns:
-        Tuple containing formatted content, word count and estimated tokens.
-    """
-    try:
-        display_path = ""
-        if path_format == 'name_only':
-            display_path = file_path.name
-        elif path_format == 'relative':
-            display_path = os.path.relpath(file_path.resolve(), pathlib.Path.cwd())
-        else: # 'full'
-            display_path = str(file_path.resolve())
-
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-
-        original_tokens = len(content) // 4
-        warning_message = ""
-
-        if original_tokens > max_tokens_doc:
-            max_chars = max_tokens_doc * 4
-            content = content[:max_chars]
-            warning_message = (
-                f"// warning_content_truncated=\"true\" "
-                f"original_token_count=\"{original_tokens}\" "
-                f"new_token_count=\"{max_tokens_doc}\"\n"
-            )
-            pp(f"  -> Warning: File '{display_path}' was truncated to ~{max_tokens_doc} tokens.")
-
-        word_count = len(content.split())
-        estimated_tokens = len(content) // 4
-        formatted_content = f"// filename=\"{display_path}\"\n{warning_message}{content}\n"
-
-        return formatted_content, word_count, estimated_tokens
-    except Exception as e:
-        error_message = f"// error_processing_file=\"{file_path.resolve()}\"\n// Error: {e}\n"
-        return error_message, 0, 0
-
 # Effective Configuration
 # =========================
 
@@ -910,26 +552,30 @@ def main():
 
         elif path_arg.is_dir():
             pp(f"Processing directory: {path_arg.resolve()}")
+            child_paths = []
             for child_path in path_arg.rglob('*'):
                 if child_path.is_file():
                     # Check .aiignore
                     if should_ignore_path(child_path.resolve(), aiignore_spec, base_path):
                         files_skipped_count += 1
                         continue
-                    # Check if binary
-                    if is_binary_file(child_path):
-                        files_skipped_count += 1
-                        continue
-                    # Process text file
-                    content, word_count, estimated_tokens = process_file(child_path, path_format_option, args.max_tokens_doc)
-                    pp(f"  -> Processing: {child_path.relative_to(path_arg)} ({word_count} words, ~{estimated_tokens} tokens)")
-                    if content.startswith("// error_processing_file"):
-                        files_error_count += 1
-                    else:
-                        files_processed_count += 1
-                        total_word_count += word_count
-                        total_estimated_tokens += estimated_tokens
-                    all_files_content.append(content)
+                    child_paths.append(child_path)
+
+            # Binary check and read happen in one batch so file I/O overlaps
+            results = process_files(child_paths, path_format_option, args.max_tokens_doc)
+            for child_path, result in zip(child_paths, results):
+                if result is None:
+                    files_skipped_count += 1
+                    continue
+                content, word_count, estimated_tokens = result
+                pp(f"  -> Processing: {child_path.relative_to(path_arg)} ({word_count} words, ~{estimated_tokens} tokens)")
+                if content.startswith("// error_processing_file"):
+                    files_error_count += 1
+                else:
+                    files_processed_count += 1
+                    total_word_count += word_count
+                    total_estimated_tokens += estimated_tokens
+                all_files_content.append(content)
         else:
             pp(f"Warning: Path '{path_arg}' is not a file or directory. Skipping.")
 
@@ -942,12 +588,12 @@ def main():
             pp(f"{files_skipped_count} file(s) were ignored (binary or .aiignore).")
         return
 
-    original_total_tokens = len(final_text) // 4
+    original_total_tokens = len(final_text) >> 2
     if args.max_tokens and original_total_tokens > args.max_tokens:
         pp(f"\nWarning: Final context with ~{original_total_tokens} tokens exceeded limit of {args.max_tokens}. Truncating...")
         max_chars = args.max_tokens * 4
         final_text = final_text[:max_chars]
-        pp(f"New estimated token count in context: ~{len(final_text) // 4}")
+        pp(f"New estimated token count in context: ~{len(final_text) >> 2}")
 
     # Make OpenRouter call if prompt exists
     if args.prompt:
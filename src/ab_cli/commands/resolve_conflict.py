@@ -5,9 +5,14 @@ resolve-conflict - Analyze merge conflicts and suggest resolutions using LLM.
 Detects conflict markers, extracts versions, and suggests merged content.
 """
 import argparse
+import collections
+import itertools
 import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
 from typing import Dict, List, Optional, Tuple
 
 from ab_cli.core.config import get_language
@@ -28,10 +33,19 @@ from ab_cli.utils import (
     get_conflicted_files,
 )
 
+# A complete conflict block: "<<<<<<<", "=======" and ">>>>>>>" marker lines, in order.
+_CONFLICT_RE = re.compile(
+    r'^<{7}[^\n]*\n.*?^={7}[^\n]*\n.*?^>{7}',
+    re.MULTILINE | re.DOTALL,
+)
+
+# parse_conflicts states
+_OUTSIDE, _IN_OURS, _IN_THEIRS = range(3)
+
 
 def has_conflict_markers(content: str) -> bool:
-    """Check if content has conflict markers."""
-    return '<<<<<<<' in content and '=======' in content and '>>>>>>>' in content
+    """Check if content has a complete, ordered set of conflict markers."""
+    return _CONFLICT_RE.search(content) is not None
 
 
 def parse_conflicts(content: str) -> List[Dict]:
@@ -79,59 +93,58 @@ def parse_conflicts(content: str) -> List[Dict]:
         ['x = 2']
     """
     conflicts = []
-    lines = content.split('\n')
-
-    i = 0
-    while i < len(lines):
-        if lines[i].startswith('<<<<<<<'):
-            conflict = {
-                'start_line': i + 1,
-                'ours_marker': lines[i],
-                'ours': [],
-                'theirs': [],
-                'theirs_marker': '',
-                'end_line': 0,
-            }
-
-            i += 1
-            # Collect "ours" version
-            while i < len(lines) and not lines[i].startswith('======='):
-                conflict['ours'].append(lines[i])
-                i += 1
-
-            if i < len(lines):
-                i += 1  # Skip =======
-
-            # Collect "theirs" version
-            while i < len(lines) and not lines[i].startswith('>>>>>>>'):
-                conflict['theirs'].append(lines[i])
-                i += 1
-
-            if i < len(lines):
-                conflict['theirs_marker'] = lines[i]
-                conflict['end_line'] = i + 1
-                i += 1
-
-            conflicts.append(conflict)
+    conflict = None
+    state = _OUTSIDE
+
+    for line_no, line in enumerate(content.split('\n'), 1):
+        if state == _OUTSIDE:
+            if line.startswith('<<<<<<<'):
+                conflict = {
+                    'start_line': line_no,
+                    'ours_marker': line,
+                    'ours': [],
+                    'theirs': [],
+                    'theirs_marker': '',
+                    'end_line': 0,
+                }
+                conflicts.append(conflict)
+                state = _IN_OURS
+        elif state == _IN_OURS:
+            if line.startswith('======='):
+                state = _IN_THEIRS
+            else:
+                conflict['ours'].append(line)
+        elif line.startswith('>>>>>>>'):
+            conflict['theirs_marker'] = line
+            conflict['end_line'] = line_no
+            state = _OUTSIDE
         else:
-            i += 1
+            conflict['theirs'].append(line)
 
     return conflicts
 
 
 def get_file_context(filepath: str, conflict: Dict, context_lines: int = 10) -> Tuple[str, str]:
-    """Get context before and after the conflict."""
+    """Get context before and after the conflict.
+
+    Lines before the context window are skipped without being kept, and
+    reading stops at the end of the trailing context, so memory stays
+    proportional to the window rather than the file.
+    """
+    start = max(0, conflict['start_line'] - context_lines - 1)
+    end = max(0, conflict['end_line'] + context_lines)
+    stop = max(end, conflict['start_line'] - 1)
+    skip = min(start, conflict['end_line'])
+
     try:
         with open(filepath, 'r') as f:
-            lines = f.readlines()
+            collections.deque(itertools.islice(f, skip), maxlen=0)
+            lines = list(itertools.islice(f, stop - skip))
     except Exception:
         return "", ""
 
-    start = max(0, conflict['start_line'] - context_lines - 1)
-    end = min(len(lines), conflict['end_line'] + context_lines)
-
-    before = ''.join(lines[start:conflict['start_line'] - 1])
-    after = ''.join(lines[conflict['end_line']:end])
+    before = ''.join(lines[start - skip:conflict['start_line'] - 1 - skip])
+    after = ''.join(lines[conflict['end_line'] - skip:end - skip])
 
     return before, after
 
@@ -205,25 +218,42 @@ RESOLVED CODE:"""
 
 
 def apply_resolution(filepath: str, conflict: dict, resolved_code: str) -> bool:
-    """Apply the resolved code to the file."""
+    """Apply the resolved code to the file.
+
+    The new content is written to a temporary file next to the target and
+    moved over it with os.replace, so an interrupted write never leaves a
+    half-written file behind.
+    """
+    tmp_path = None
     try:
         with open(filepath, 'r') as f:
             lines = f.readlines()
 
         # Replace conflict section with resolved code
-        new_lines = (
+        new_content = ''.join(
             lines[:conflict['start_line'] - 1]
             + [resolved_code + '\n']
             + lines[conflict['end_line']:]
         )
 
-        with open(filepath, 'w') as f:
-            f.writelines(new_lines)
+        target = os.path.realpath(filepath)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.resolve-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(new_content)
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+        tmp_path = None
 
         return True
     except Exception as e:
         log_error(f"Failed to apply resolution: {e}")
         return False
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 def display_resolution(filepath: str, conflict: dict, resolved: str) -> None:
@@ -242,7 +272,8 @@ def display_resolution(filepath: str, conflict: dict, resolved: str) -> None:
 
 
 @handle_cli_errors
-def main():
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run resolve-conflict and return its exit code."""
     parser = argparse.ArgumentParser(
         description='Resolve merge conflicts using LLM',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -276,12 +307,12 @@ Examples:
     )
     add_llm_request_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Check if in git repo
     if not is_git_repo():
         log_error("Not inside a git repository")
-        sys.exit(1)
+        return 1
 
     # Get language from config if not specified
     lang = args.lang or get_language('resolve-conflict')
@@ -290,14 +321,14 @@ Examples:
     if args.file:
         if not os.path.exists(args.file):
             log_error(f"File not found: {args.file}")
-            sys.exit(1)
+            return 1
         files = [args.file]
     else:
         files = get_conflicted_files()
 
     if not files:
         log_warning("No conflicted files found")
-        sys.exit(0)
+        return 0
 
     log_info(f"Found {len(files)} file(s) with conflicts")
 
@@ -383,6 +414,8 @@ Examples:
     if resolved_count > 0:
         log_info("Run 'git add' on resolved files, then 'git commit' to complete the merge")
 
+    return 0
+
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
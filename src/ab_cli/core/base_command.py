@@ -56,6 +56,10 @@ class CliCommand(ABC):
 
     Attributes:
         parser (argparse.ArgumentParser): The argument parser instance
+        share_parser (bool): Build the parser once per subclass and reuse it
+            for every instance (default False). Only opt in when the parser
+            is fully built by setup_arguments() and never touched after
+            __init__().
 
     Exit Codes:
         0: Success
@@ -63,13 +67,28 @@ class CliCommand(ABC):
         130: Cancelled (KeyboardInterrupt)
     """
 
+    share_parser: bool = False
+    _shared_parser: Optional[argparse.ArgumentParser] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each subclass caches its own parser
+        cls._shared_parser = None
+
     def __init__(self):
         """Initialize the command with an argument parser."""
+        cls = type(self)
+        if cls.share_parser and cls._shared_parser is not None:
+            self.parser = cls._shared_parser
+            return
+
         self.parser = argparse.ArgumentParser(
             description=self.get_description(),
             formatter_class=argparse.RawDescriptionHelpFormatter
         )
         self.setup_arguments()
+        if cls.share_parser:
+            cls._shared_parser = self.parser
 
     @abstractmethod
     def get_description(self) -> str:
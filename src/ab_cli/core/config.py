@@ -2,13 +2,32 @@
 Centralized configuration module for ab CLI utilities.
 Handles loading, saving, and managing configuration.
 """
+import bisect
+import contextlib
 import json
 import os
 import pathlib
-from typing import Any, Dict, Optional
+import shutil
+import sys
+import tempfile
+import time
+from copy import deepcopy
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
+from ab_cli.core.llm_settings import DEFAULT_REASONING_EFFORT, DEFAULT_SERVICE_TIER
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json otherwise
+    orjson = None
+
+
+AB_CONFIG_DIR = pathlib.Path.home() / ".ab"
+AB_CONFIG_FILE = AB_CONFIG_DIR / "config.json"
+AB_HISTORY_DIR = AB_CONFIG_DIR / "history"
+
 
 # Pydantic models for configuration validation
 class GlobalConfigModel(BaseModel):
@@ -48,44 +67,9 @@ class HistoryConfigModel(BaseModel):
     directory: str = ""
 
 
-class AbConfigModel(BaseModel):
-    """Root configuration model for ab CLI."""
-    model_config = ConfigDict(extra='allow', populate_by_name=True)
-
-    version: str = "1.0"
-    global_settings: GlobalConfigModel = Field(
-        default_factory=GlobalConfigModel,
-        alias="global"
-    )
-    models: ModelsConfigModel = Field(default_factory=ModelsConfigModel)
-    commands: Dict[str, Any] = Field(default_factory=dict)
-    history: HistoryConfigModel = Field(default_factory=HistoryConfigModel)
-
-AB_CONFIG_DIR = pathlib.Path.home() / ".ab"
-AB_CONFIG_FILE = AB_CONFIG_DIR / "config.json"
-AB_HISTORY_DIR = AB_CONFIG_DIR / "history"
-
-DEFAULT_CONFIG: Dict[str, Any] = {
-    "version": "1.0",
-    "global": {
-        "language": "en",
-        "api_base": "https://openrouter.ai/api/v1",
-        "api_key_env": "OPENROUTER_API_KEY",
-        "timeout_seconds": 300,
-        "reasoning_effort": "medium",
-        "service_tier": "default"
-    },
-    "models": {
-        "small": "nvidia/nemotron-3-nano-30b-a3b:free",
-        "medium": "openai/gpt-5-nano",
-        "large": "x-ai/grok-4.1-fast",
-        "default": "nvidia/nemotron-3-nano-30b-a3b:free",
-        "thresholds": {
-            "small_max_tokens": 128000,
-            "medium_max_tokens": 256000
-        }
-    },
-    "commands": {
+def _default_command_settings() -> Dict[str, Any]:
+    """Per-command defaults for a config without a commands section."""
+    return {
         "auto-commit": {},
         "pr-description": {},
         "rewrite-history": {
@@ -100,29 +84,131 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "passgenerator": {
             "default_length": 16
         }
-    },
-    "history": {
-        "enabled": True,
-        "directory": str(AB_HISTORY_DIR)
     }
-}
+
+
+class AbConfigModel(BaseModel):
+    """Root configuration model for ab CLI."""
+    model_config = ConfigDict(extra='allow', populate_by_name=True)
+
+    version: str = "1.0"
+    global_settings: GlobalConfigModel = Field(
+        default_factory=GlobalConfigModel,
+        alias="global"
+    )
+    models: ModelsConfigModel = Field(default_factory=ModelsConfigModel)
+    commands: Dict[str, Any] = Field(default_factory=dict)
+    history: HistoryConfigModel = Field(default_factory=HistoryConfigModel)
+
+
+# Model tiers in ascending context size; select_model() bisects the token
+# count into the matching max_tokens thresholds.
+MODEL_TIERS = ("small", "medium", "large")
+
+# Defaults for a fresh config. The validation model keeps its own, looser
+# defaults so that loading a partial file does not inject these sections.
+DEFAULT_CONFIG: Dict[str, Any] = AbConfigModel(
+    global_settings=GlobalConfigModel(
+        reasoning_effort=DEFAULT_REASONING_EFFORT,
+        service_tier=DEFAULT_SERVICE_TIER,
+    ),
+    commands=_default_command_settings(),
+    history=HistoryConfigModel(directory=str(AB_HISTORY_DIR)),
+).model_dump(by_alias=True)
+
+
+def _flatten_config(tree: Dict[str, Any], prefix: str, out: Dict[str, Any]) -> None:
+    """Index every subtree and leaf of tree under its dot-notation path.
+
+    Keys that contain a dot are skipped: a dot-notation path can never
+    address them. Paths are interned, so lookups with the string literals
+    used at call sites match by identity instead of comparing characters.
+    """
+    for key, value in tree.items():
+        if '.' in key:
+            continue
+        path = sys.intern(prefix + key)
+        out[path] = value
+        if isinstance(value, dict):
+            _flatten_config(value, path + '.', out)
+
+
+def _loads_config(raw: bytes) -> Any:
+    """Parse config file bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_config(data: Dict[str, Any]) -> bytes:
+    """Serialize config as 2-space indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# A file modified this recently may be rewritten again within the same
+# timestamp tick, so its stat signature is not trusted by reload().
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _config_file_signature() -> Tuple[Any, ...]:
+    """Identify the current state of AB_CONFIG_FILE without reading it."""
+    try:
+        st = AB_CONFIG_FILE.stat()
+    except OSError:
+        # Missing, unreadable or shadowed by a file in its path: no config
+        return (str(AB_CONFIG_FILE), None)
+    return (str(AB_CONFIG_FILE), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _detached(value: Any) -> Any:
+    """Copy mutable config values so callers cannot alter the loaded tree."""
+    if isinstance(value, (dict, list, set)):
+        return deepcopy(value)
+    return value
+
+
+# Flat dot-path index of DEFAULT_CONFIG for get_with_default() fallbacks
+_DEFAULT_FLAT: Dict[str, Any] = {}
+_flatten_config(DEFAULT_CONFIG, '', _DEFAULT_FLAT)
 
 
 class ConfigValidationError(Exception):
-    """Raised when configuration validation fails."""
+    """
+    Raised when configuration validation fails.
+
+    errors is stored as a tuple (lists are accepted). An optional detail
+    object, such as the underlying pydantic ValidationError, is only
+    rendered when the exception is converted to a string.
+    """
 
-    def __init__(self, message: str, errors: list = None):
+    def __init__(self, message: str, errors: Iterable[Any] = (), detail: Any = None):
         super().__init__(message)
-        self.errors = errors or []
+        self.errors: Tuple[Any, ...] = tuple(errors or ())
+        self.detail = detail
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.detail is None:
+            return message
+        return f"{message}: {self.detail}"
 
 
 class AbConfig:
     """Configuration manager for ab CLI (singleton)."""
 
     _instance: Optional['AbConfig'] = None
-    _config: Dict[str, Any]
-    _validated_model: Optional[AbConfigModel] = None
-    _validation_errors: list = []
+
+    # The singleton is hit on every config lookup; slots keep its attribute
+    # loads on the fast descriptor path and rule out stray attributes.
+    __slots__ = (
+        '_config', '_loaded', '_validated_model', '_validation_errors',
+        '_env_snapshot', '_flat', '_flat_source', '_tier_bounds',
+        '_tier_models', '_dirty', '_autoflush', '_durable',
+        '_file_signature', '_snapshot', '_snapshot_source',
+        '_global_settings', '_cmd_settings', '_history_dir',
+    )
 
     def __new__(cls):
         if cls._instance is None:
@@ -131,8 +217,32 @@ class AbConfig:
             cls._instance._loaded = False
             cls._instance._validated_model = None
             cls._instance._validation_errors = []
+            cls._instance._env_snapshot = {}
+            cls._instance._flat = {}
+            cls._instance._flat_source = None
+            cls._instance._tier_bounds = ()
+            cls._instance._tier_models = ()
+            cls._instance._dirty = False
+            cls._instance._autoflush = True
+            cls._instance._durable = False
+            cls._instance._file_signature = None
+            cls._instance._snapshot = b''
+            cls._instance._snapshot_source = None
+            cls._instance._global_settings = {}
+            cls._instance._cmd_settings = {}
+            cls._instance._history_dir = None
         return cls._instance
 
+    @classmethod
+    def reset_for_testing(cls) -> None:
+        """
+        Drop the singleton so the next AbConfig() starts from scratch.
+
+        Nothing is read or written; the new instance loads the config file
+        lazily on first access, like a fresh process would.
+        """
+        cls._instance = None
+
     def _ensure_loaded(self) -> None:
         """Ensure configuration is loaded."""
         if not self._loaded:
@@ -142,11 +252,15 @@ class AbConfig:
         """Load configuration from file or use defaults."""
         self._validation_errors = []
         self._validated_model = None
+        signature = _config_file_signature()
+        mtime_ns = signature[1]
+        if mtime_ns is not None and time.time_ns() - mtime_ns < _RACY_WINDOW_NS:
+            signature = None
+        self._file_signature = signature
 
-        if AB_CONFIG_FILE.exists():
+        if mtime_ns is not None:
             try:
-                with open(AB_CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    raw_config = json.load(f)
+                raw_config = _loads_config(AB_CONFIG_FILE.read_bytes())
                 # Validate with Pydantic
                 self._config, self._validated_model = self._validate_config(raw_config)
             except (json.JSONDecodeError, IOError) as e:
@@ -174,7 +288,7 @@ class AbConfig:
             self._validation_errors = e.errors()
             print(f"Warning: Configuration validation failed: {e}")
             # Merge with defaults to ensure valid config
-            merged = self._deep_merge(self._deep_copy(DEFAULT_CONFIG), raw_config)
+            merged = self._deep_merge(self._deep_copy(DEFAULT_CONFIG), raw_config, copy=False)
             # Try to validate merged config
             try:
                 model = AbConfigModel.model_validate(merged)
@@ -202,13 +316,25 @@ class AbConfig:
             return AbConfigModel.model_validate(data)
         except ValidationError as e:
             raise ConfigValidationError(
-                f"Configuration validation failed: {e}",
-                errors=e.errors()
+                "Configuration validation failed",
+                errors=e.errors(),
+                detail=e
             )
 
     def get_validated_model(self) -> Optional[AbConfigModel]:
-        """Get the validated Pydantic model for the current config."""
+        """
+        Get the validated Pydantic model for the current config.
+
+        The model is built once per load and reused; after set() it is
+        re-validated on the next call. Returns None if the changed config
+        no longer validates.
+        """
         self._ensure_loaded()
+        if self._validated_model is None:
+            try:
+                self._validated_model = AbConfigModel.model_validate(self._config)
+            except ValidationError:
+                return None
         return self._validated_model
 
     def get_validation_errors(self) -> list:
@@ -225,18 +351,50 @@ class AbConfig:
         """Deep copy a dictionary."""
         return json.loads(json.dumps(d))
 
-    def _deep_merge(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-        """Deep merge two dictionaries, override takes precedence."""
-        result = self._deep_copy(base)
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
-        return result
+    def _deep_merge(self, base: Dict[str, Any], override: Dict[str, Any],
+                    *, copy: bool = True) -> Dict[str, Any]:
+        """
+        Deep merge two dictionaries, override takes precedence.
+
+        With copy=True (default) base is left untouched: only the dicts on
+        the merged paths are copied, untouched subtrees are shared with the
+        result. With copy=False base is updated in place and returned.
+        An empty override returns base itself in either mode.
+        """
+        if not override:
+            return base
+        if copy:
+            base = {**base}
+        stack = [(base, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                # Membership check first: a missing key must still receive
+                # an override of None.
+                if key in target and target[key] is value:
+                    continue
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    if not value:
+                        continue
+                    if copy:
+                        current = target[key] = {**current}
+                    stack.append((current, value))
+                else:
+                    target[key] = value
+        return base
 
     def reload(self) -> None:
-        """Force reload configuration from file."""
+        """
+        Reload configuration from file.
+
+        Skipped when the file's mtime, size and inode match the last load
+        and there are no unsaved changes, so an unchanged file costs one
+        stat() instead of a parse and validation.
+        """
+        if (self._loaded and not self._dirty and self._file_signature is not None
+                and self._file_signature == _config_file_signature()):
+            return
         self._loaded = False
         self._ensure_loaded()
 
@@ -244,19 +402,56 @@ class AbConfig:
         """
         Get config value by dot-notation path.
 
+        Sections and other mutable values are returned as deep copies: the
+        path index would not see changes made through them. Use set() to
+        change the config.
+
         Example: config.get('global.language', 'en')
         """
         self._ensure_loaded()
-        keys = path.split('.')
-        value = self._config
-
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
+        if self._flat_source is not self._config:
+            self._reindex()
+        value = self._flat.get(path)
+        if value is None:
+            return default
+        return _detached(value)
+
+    def _reindex(self) -> None:
+        """Rebuild the path index, model tiers and command settings from the config."""
+        self._flat = {}
+        _flatten_config(self._config, '', self._flat)
+        self._flat_source = self._config
 
-        return value if value is not None else default
+        thresholds = self.get('models.thresholds', {})
+        small_max = thresholds.get('small_max_tokens', 128000)
+        medium_max = thresholds.get('medium_max_tokens', 256000)
+        # Clamping keeps a medium_max below small_max from shadowing the
+        # small tier.
+        self._tier_bounds = (small_max, max(small_max, medium_max))
+        self._tier_models = tuple(self.get_with_default(f'models.{tier}') for tier in MODEL_TIERS)
+
+        # (command, setting) -> value, with global settings overlaid for
+        # every configured command; None values count as unset.
+        global_settings: Dict[str, Any] = {}
+        cmd_settings: Dict[Tuple[str, str], Any] = {}
+        commands = []
+        for path, value in self._flat.items():
+            head, _, rest = path.partition('.')
+            if head == 'global' and rest and value is not None:
+                global_settings[rest] = value
+            elif head == 'commands' and rest:
+                command, sep, setting = rest.partition('.')
+                if not sep:
+                    if isinstance(value, dict):
+                        commands.append(command)
+                elif value is not None:
+                    cmd_settings[(command, setting)] = value
+        for command in commands:
+            for setting, value in global_settings.items():
+                cmd_settings.setdefault((command, setting), value)
+        self._global_settings = global_settings
+        self._cmd_settings = cmd_settings
+        self._history_dir = None
 
     def set(self, path: str, value: Any) -> None:
         """
@@ -265,22 +460,91 @@ class AbConfig:
         Example: config.set('global.language', 'pt-br')
         """
         self._ensure_loaded()
-        keys = path.split('.')
         config = self._config
 
-        # Navigate to parent
-        for key in keys[:-1]:
+        # Navigate to parent, one segment at a time
+        key, sep, rest = path.partition('.')
+        while sep:
             config = config.setdefault(key, {})
+            key, sep, rest = rest.partition('.')
 
         # Set value
-        config[keys[-1]] = value
-        self._save()
+        config[key] = value
+        self._flat_source = None
+        self._snapshot_source = None
+        self._validated_model = None
+        self._dirty = True
+        if self._autoflush:
+            self._save()
+
+    def flush(self) -> None:
+        """Write pending set() changes to disk, if there are any."""
+        if self._dirty:
+            self._save()
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator['AbConfig']:
+        """
+        Defer persistence of set() calls until the block exits.
+
+        Example:
+            with config.batch():
+                config.set('global.language', 'pt-br')
+                config.set('models.default', 'openai/gpt-5-nano')
+        """
+        previous = self._autoflush
+        self._autoflush = False
+        try:
+            yield self
+        finally:
+            self._autoflush = previous
+            if previous:
+                self.flush()
+
+    def set_durable(self, enabled: bool = True) -> None:
+        """
+        Choose whether saves fsync the config before swapping it in.
+
+        Off by default: a crash right after a save may then lose that save,
+        but never leaves a half-written file behind.
+        """
+        self._durable = enabled
 
     def _save(self) -> None:
-        """Save configuration to file."""
+        """
+        Save configuration to file.
+
+        The file is written to a temporary sibling and swapped in with
+        os.replace(), so readers never see a half-written config. A symlinked
+        config file is followed, so the link itself is kept. See set_durable()
+        to fsync the data before the swap.
+        """
         AB_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(AB_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self._config, f, indent=2, ensure_ascii=False)
+        target = os.path.realpath(AB_CONFIG_FILE)
+        data = _dumps_config(self._config)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.config-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                if self._durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if os.path.exists(target):
+                shutil.copymode(target, tmp_path)
+            else:
+                # mkstemp creates 0600; give a new file the usual umask mode
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, target)
+            self._file_signature = None
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
 
     def get_with_default(self, path: str) -> Any:
         """Get config value with fallback to DEFAULT_CONFIG."""
@@ -289,14 +553,8 @@ class AbConfig:
             return value
 
         # Fallback to default
-        keys = path.split('.')
-        default_value = DEFAULT_CONFIG
-        for key in keys:
-            if isinstance(default_value, dict) and key in default_value:
-                default_value = default_value[key]
-            else:
-                return None
-        return default_value
+        value = _DEFAULT_FLAT.get(path)
+        return _detached(value)
 
     def select_model(self, tokens: int) -> str:
         """
@@ -305,17 +563,14 @@ class AbConfig:
         Returns appropriate model for the given context size.
         """
         self._ensure_loaded()
+        if self._flat_source is not self._config:
+            self._reindex()
 
-        thresholds = self.get('models.thresholds', {})
-        small_max = thresholds.get('small_max_tokens', 128000)
-        medium_max = thresholds.get('medium_max_tokens', 256000)
-
-        if tokens <= small_max:
-            return self.get_with_default('models.small')
-        elif tokens <= medium_max:
-            return self.get_with_default('models.medium')
-        else:
-            return self.get_with_default('models.large')
+        bounds = self._tier_bounds
+        if tokens <= bounds[0]:
+            return self._tier_models[0]
+        # Upper bounds are inclusive, hence bisect_left
+        return self._tier_models[bisect.bisect_left(bounds, tokens)]
 
     def get_command_setting(self, command: str, setting: str, default: Any = None) -> Any:
         """
@@ -327,18 +582,15 @@ class AbConfig:
         3. default parameter
         """
         self._ensure_loaded()
+        if self._flat_source is not self._config:
+            self._reindex()
 
-        # Try command-specific first
-        cmd_value = self.get(f'commands.{command}.{setting}')
-        if cmd_value is not None:
-            return cmd_value
-
-        # Fallback to global
-        global_value = self.get(f'global.{setting}')
-        if global_value is not None:
-            return global_value
-
-        return default
+        value = self._cmd_settings.get((command, setting))
+        if value is not None:
+            return _detached(value)
+        # Commands without a section of their own only see global
+        value = self._global_settings.get(setting)
+        return _detached(value) if value is not None else default
 
     def get_api_settings(self) -> Dict[str, Any]:
         """Get API-related settings."""
@@ -351,12 +603,39 @@ class AbConfig:
             'service_tier': self.get_with_default('global.service_tier'),
         }
 
+    def get_api_key(self, env_var: Optional[str] = None) -> Optional[str]:
+        """
+        Get the API key from the environment, reading each variable once.
+
+        Args:
+            env_var: Environment variable holding the key. Defaults to
+                global.api_key_env.
+
+        Returns:
+            The key, or None if the variable is not set.
+        """
+        if env_var is None:
+            env_var = self.get_with_default('global.api_key_env')
+        try:
+            return self._env_snapshot[env_var]
+        except KeyError:
+            value = self._env_snapshot[env_var] = os.environ.get(env_var)
+            return value
+
+    def refresh_env(self) -> None:
+        """Drop the cached environment values so get_api_key() re-reads them."""
+        self._env_snapshot.clear()
+
     def get_history_dir(self) -> pathlib.Path:
-        """Get history directory path."""
+        """Get history directory path (cached until the config changes)."""
         self._ensure_loaded()
-        dir_str = self.get('history.directory', str(AB_HISTORY_DIR))
-        # Expand ~ if present
-        return pathlib.Path(os.path.expanduser(dir_str))
+        if self._flat_source is not self._config:
+            self._reindex()
+        if self._history_dir is None:
+            dir_str = self.get('history.directory', str(AB_HISTORY_DIR))
+            # Expand ~ if present
+            self._history_dir = pathlib.Path(os.path.expanduser(dir_str))
+        return self._history_dir
 
     def is_history_enabled(self) -> bool:
         """Check if history tracking is enabled."""
@@ -377,9 +656,18 @@ class AbConfig:
         return True
 
     def to_dict(self) -> Dict[str, Any]:
-        """Return full configuration as dictionary."""
+        """
+        Return full configuration as dictionary.
+
+        The result is an independent copy. It is parsed from a serialized
+        snapshot that is kept until the config changes, so repeated calls
+        skip the serialization half of the copy.
+        """
         self._ensure_loaded()
-        return self._deep_copy(self._config)
+        if self._snapshot_source is not self._config:
+            self._snapshot = _dumps_config(self._config)
+            self._snapshot_source = self._config
+        return _loads_config(self._snapshot)
 
     def config_exists(self) -> bool:
         """Check if config file exists."""
@@ -397,7 +685,14 @@ class AbConfig:
 
 
 def get_config() -> AbConfig:
-    """Get the singleton config instance."""
+    """Get the singleton config instance.
+
+    The config file is parsed lazily on first access and kept in memory,
+    so repeated calls only return the cached instance.
+    """
+    instance = AbConfig._instance
+    if instance is not None:
+        return instance
     return AbConfig()
 
 
@@ -406,7 +701,17 @@ def estimate_tokens(text: str) -> int:
     Estimate token count from text.
     Uses ~4 characters per token approximation.
     """
-    return len(text) // 4
+    return len(text) >> 2
+
+
+def estimate_tokens_batch(texts: Iterable[str]) -> int:
+    """
+    Estimate token count for several texts as if they were concatenated.
+
+    Equivalent to ``estimate_tokens("".join(texts))`` without building
+    the joined string.
+    """
+    return sum(map(len, texts)) >> 2
 
 
 # Convenience functions for common operations
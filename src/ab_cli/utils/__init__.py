@@ -88,6 +88,7 @@ from ab_cli.utils.file_processing import (
     load_aiignore_spec,
     should_ignore_path,
     process_file,
+    process_files,
     estimate_file_tokens,
     get_directory_files,
 )
@@ -182,6 +183,7 @@ __all__ = [
     'load_aiignore_spec',
     'should_ignore_path',
     'process_file',
+    'process_files',
     'estimate_file_tokens',
     'get_directory_files',
     # History
@@ -3,16 +3,34 @@
 This module provides functions for communicating with LLM APIs.
 Extracted from commands/prompt.py to avoid circular imports.
 """
-import os
+import atexit
+import json
 import sys
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json via requests otherwise
+    orjson = None
+
+from ab_cli.core.config import get_config
+
 
 # Module-level verbose flag (can be set by callers)
 VERBOSE = True
 
+# Shared HTTP session, created on first use (see get_http_session)
+_SESSION: Optional[requests.Session] = None
+
+# Specialist persona prompts, keyed by the --specialist choice.
+_SPECIALISTS: Mapping[str, str] = MappingProxyType({
+    'dev': 'Act as a senior programmer specialized in software development, with over 20 years of experience. Your responses should be clear, efficient, well-structured and follow industry best practices. Think step by step.',
+    'rm': 'Act as a senior Retail Media analyst, specialized in digital advertising strategies for e-commerce and marketplaces. Your knowledge covers platforms like Amazon Ads, Mercado Ads and Criteo. Your responses should be analytical, strategic and data-driven.'
+})
+
 
 def pp(*args, **kwargs):
     """Print only if VERBOSE is True."""
@@ -20,6 +38,23 @@ def pp(*args, **kwargs):
         print(*args, **kwargs)
 
 
+def get_http_session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use.
+
+    Commands that call the API repeatedly (e.g. one request per commit)
+    reuse the pooled keep-alive connection instead of a new TLS handshake
+    per call.
+
+    Returns:
+        The shared requests.Session
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        atexit.register(_SESSION.close)
+    return _SESSION
+
+
 def build_specialist_prefix(specialist: Optional[str]) -> str:
     """Build a specialist prompt prefix based on the given persona.
 
@@ -29,11 +64,24 @@ def build_specialist_prefix(specialist: Optional[str]) -> str:
     Returns:
         The specialist prompt prefix string, or empty string if no specialist
     """
-    specialist_prompts = {
-        'dev': 'Act as a senior programmer specialized in software development, with over 20 years of experience. Your responses should be clear, efficient, well-structured and follow industry best practices. Think step by step.',
-        'rm': 'Act as a senior Retail Media analyst, specialized in digital advertising strategies for e-commerce and marketplaces. Your knowledge covers platforms like Amazon Ads, Mercado Ads and Criteo. Your responses should be analytical, strategic and data-driven.'
-    }
-    return specialist_prompts.get(specialist or "", "")
+    return _SPECIALISTS.get(specialist or "", "")
+
+
+def parse_json_response(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed.
+
+    orjson parses the raw bytes directly, skipping the text decode that
+    ``response.json()`` performs first.
+
+    Args:
+        response: HTTP response with a JSON body
+
+    Returns:
+        The decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optional[str],
@@ -59,26 +107,29 @@ def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optiona
     Returns:
         Dict with response data or None on failure
     """
-    api_key = os.getenv(api_key_env)
+    api_key = get_config().get_api_key(api_key_env)
     if not api_key:
         # Always print error to stderr, regardless of VERBOSE
         print(f"Error: The environment variable {api_key_env} is not defined.", file=sys.stderr)
         return None
 
-    # Build full prompt
+    # Build full prompt; separators are explicit parts so the (possibly
+    # large) context is copied exactly once, by the final join.
     parts = []
     specialist_prefix = build_specialist_prefix(specialist)
     if specialist_prefix:
         parts.append(specialist_prefix)
+        parts.append("\n\n")
 
     parts.append(prompt)
 
-    if context.strip():
-        parts.append("\n--- FILE CONTEXT ---\n" + context)
+    if context and not context.isspace():
+        parts.append("\n\n\n--- FILE CONTEXT ---\n")
+        parts.append(context)
 
-    parts.append(f"--- OUTPUT INSTRUCTION ---\nRespond strictly in language: {lang}.")
+    parts.append(f"\n\n--- OUTPUT INSTRUCTION ---\nRespond strictly in language: {lang}.")
 
-    full_prompt = "\n\n".join(parts)
+    full_prompt = "".join(parts)
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -107,9 +158,9 @@ def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optiona
 
     try:
         pp(f"Sending request to OpenRouter ({model_name})...")
-        response = requests.post(url, headers=headers, json=payload, timeout=timeout_s)
+        response = get_http_session().post(url, headers=headers, json=payload, timeout=timeout_s)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json_response(response)
 
         message = data['choices'][0]['message']
         text_response = message.get('content') or ''
@@ -136,6 +187,12 @@ def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optiona
             "full_prompt": full_prompt,
         }
 
+    except json.JSONDecodeError as e:
+        # Both decoders land here: orjson.JSONDecodeError and the one
+        # response.json() raises subclass it. Checked before
+        # RequestException, which requests' variant also subclasses.
+        print(f"Invalid JSON in OpenRouter response: {e}", file=sys.stderr)
+        return None
     except requests.exceptions.RequestException as e:
         # Always print errors to stderr regardless of VERBOSE mode
         print(f"Network or HTTP error calling OpenRouter: {e}", file=sys.stderr)
@@ -148,7 +205,7 @@ def send_to_openrouter(prompt: str, context: str, lang: str, specialist: Optiona
     except (KeyError, IndexError) as e:
         print(f"Error extracting content from response: {e}", file=sys.stderr)
         try:
-            print(f"Response structure received: {response.json()}", file=sys.stderr)
+            print(f"Response structure received: {parse_json_response(response)}", file=sys.stderr)
         except Exception:
             pass
         return None
@@ -3,20 +3,45 @@
 This module handles file reading, binary detection,
 directory traversal, .aiignore support, and token estimation.
 """
+import codecs
+import functools
 import os
 import pathlib
+import re
+import stat
 import subprocess
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import FrozenSet, List, Optional, Sequence, Tuple
 
 from binaryornot.check import is_binary
 import pathspec
+from pathspec.util import normalize_file
 
 from ab_cli.utils.api import pp
 
+# pathspec tags directory matches with a named group; the same name in
+# every alternative would be a duplicate, so fused patterns drop it.
+_NAMED_GROUP_RE = re.compile(r'\(\?P<\w+>')
+_NEVER_MATCH_RE = re.compile(r'(?!)')
+# "*.log" / "*.tar.gz" and "node_modules/" style lines, which need no regex.
+_SUFFIX_PATTERN_RE = re.compile(r'\*((?:\.[A-Za-z0-9_]+)+)')
+_DIR_PATTERN_RE = re.compile(r'([A-Za-z0-9_.-]+)/')
+
+_BINARY_SNIFF_BYTES = 8192
+_WIDE_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE, codecs.BOM_UTF32_BE)
+
+# Below this many files the thread pool costs more than it saves.
+_PARALLEL_READ_MIN_FILES = 32
+_PARALLEL_READ_WORKERS = 8
+
 
 def is_binary_file(file_path: pathlib.Path) -> bool:
     """
-    Detect if a file is binary using the binaryornot library.
+    Detect if a file is binary.
+
+    Sniffs the first 8 KiB: a NUL byte means binary and valid UTF-8 means
+    text. Anything inconclusive (UTF-16/32 BOMs, legacy encodings) falls
+    back to the binaryornot library.
 
     Args:
         file_path: Path of the file to check.
@@ -24,6 +49,24 @@ def is_binary_file(file_path: pathlib.Path) -> bool:
     Returns:
         True if the file is binary, False if it's text.
     """
+    try:
+        with open(file_path, 'rb') as f:
+            chunk = f.read(_BINARY_SNIFF_BYTES)
+    except OSError:
+        return True  # If can't read, assume binary
+
+    if b'\x00' in chunk:
+        if not chunk.startswith(_WIDE_BOMS):
+            return True
+    elif chunk.isascii():
+        return False
+    else:
+        try:
+            chunk.decode('utf-8')
+            return False
+        except UnicodeDecodeError:
+            pass  # May be a split multibyte char or a legacy encoding
+
     try:
         return is_binary(str(file_path))
     except Exception:
@@ -80,6 +123,77 @@ def find_aiignore_files(start_path: pathlib.Path) -> List[pathlib.Path]:
     return aiignore_files
 
 
+class FusedIgnoreSpec(pathspec.GitIgnoreSpec):
+    """GitIgnoreSpec that tests every pattern with one fused regex first.
+
+    The union of all active patterns answers the common case (no pattern
+    matches) in a single regex call. When the spec has no negations any
+    hit means the path is ignored, so pattern order stops mattering and
+    plain ``*.ext`` / ``name/`` patterns are answered by suffix and set
+    lookups on the path components instead. With negations pathspec
+    resolves the last-match-wins ordering as before.
+    """
+
+    _compiled: bool = False
+    _union: Optional[re.Pattern] = None
+    _has_negation: bool = False
+    _ignored_suffixes: Tuple[str, ...] = ()
+    _ignored_dirs: FrozenSet[str] = frozenset()
+
+    def _compile(self) -> None:
+        active = [p for p in self.patterns if p.include is not None]
+        self._has_negation = not all(p.include for p in active)
+        if not self._has_negation:
+            suffixes, dirs, rest = [], set(), []
+            for pattern in active:
+                line = getattr(pattern, 'pattern', None)
+                line = line.rstrip('\n').rstrip(' ') if isinstance(line, str) else ''
+                match = _SUFFIX_PATTERN_RE.fullmatch(line)
+                if match:
+                    suffixes.append(match.group(1))
+                    continue
+                match = _DIR_PATTERN_RE.fullmatch(line)
+                if match and match.group(1).strip('.'):
+                    dirs.add(match.group(1))
+                    continue
+                rest.append(pattern)
+            self._ignored_suffixes = tuple(suffixes)
+            self._ignored_dirs = frozenset(dirs)
+            active = rest
+        self._union = _fuse_patterns(active)
+        self._compiled = True
+
+    def match_file(self, file, separators=None) -> bool:
+        if not self._compiled:
+            self._compile()
+        path = normalize_file(file, separators)
+        if self._ignored_suffixes or self._ignored_dirs:
+            parts = path.split('/')
+            if self._ignored_suffixes and any(part.endswith(self._ignored_suffixes) for part in parts):
+                return True
+            if not self._ignored_dirs.isdisjoint(parts[:-1]):
+                return True
+        if self._union is not None:
+            if self._union.match(path) is None:
+                return False
+            if not self._has_negation:
+                return True
+        return super().match_file(file, separators)
+
+
+def _fuse_patterns(patterns) -> Optional[re.Pattern]:
+    """Join pattern regexes into one alternation (None if one has no regex)."""
+    parts = []
+    for pattern in patterns:
+        regex = getattr(pattern, 'regex', None)
+        if regex is None:
+            return None
+        parts.append(_NAMED_GROUP_RE.sub('(?:', regex.pattern))
+    if not parts:
+        return _NEVER_MATCH_RE
+    return re.compile('|'.join(f'(?:{part})' for part in parts))
+
+
 def load_aiignore_spec(aiignore_files: List[pathlib.Path]) -> Optional[pathspec.GitIgnoreSpec]:
     """
     Load and combine patterns from multiple .aiignore files.
@@ -88,7 +202,7 @@ def load_aiignore_spec(aiignore_files: List[pathlib.Path]) -> Optional[pathspec.
         aiignore_files: List of .aiignore paths (from most specific to most general).
 
     Returns:
-        Combined spec or None if no patterns.
+        Combined spec (a FusedIgnoreSpec) or None if no patterns.
     """
     all_patterns = []
 
@@ -104,7 +218,13 @@ def load_aiignore_spec(aiignore_files: List[pathlib.Path]) -> Optional[pathspec.
     if not all_patterns:
         return None
 
-    return pathspec.GitIgnoreSpec.from_lines(all_patterns)
+    return _compile_aiignore_spec(tuple(all_patterns))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_aiignore_spec(patterns: Tuple[str, ...]) -> FusedIgnoreSpec:
+    """Compile .aiignore lines once per distinct pattern list."""
+    return FusedIgnoreSpec.from_lines(patterns)
 
 
 def should_ignore_path(
@@ -155,15 +275,21 @@ def process_file(file_path: pathlib.Path, path_format: str, max_tokens_doc: int)
         else:  # 'full'
             display_path = str(file_path.resolve())
 
+        max_chars = max(max_tokens_doc, 0) * 4
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+            # Read one token past the budget: enough to tell whether the
+            # file's token estimate exceeds it, without pulling the rest of
+            # the file into memory. The original count then comes from the
+            # byte size, so multibyte text reports more tokens than chars/4.
+            content = f.read(max_chars + 4)
+            truncated = (len(content) >> 2) > max_tokens_doc
+            if truncated:
+                original_tokens = os.fstat(f.fileno()).st_size >> 2
+                content = content[:max_chars]
 
-        original_tokens = len(content) // 4
         warning_message = ""
 
-        if original_tokens > max_tokens_doc:
-            max_chars = max_tokens_doc * 4
-            content = content[:max_chars]
+        if truncated:
             warning_message = (
                 f"// warning_content_truncated=\"true\" "
                 f"original_token_count=\"{original_tokens}\" "
@@ -172,7 +298,7 @@ def process_file(file_path: pathlib.Path, path_format: str, max_tokens_doc: int)
             pp(f"  -> Warning: File '{display_path}' was truncated to ~{max_tokens_doc} tokens.")
 
         word_count = len(content.split())
-        estimated_tokens = len(content) // 4
+        estimated_tokens = len(content) >> 2
         formatted_content = f"// filename=\"{display_path}\"\n{warning_message}{content}\n"
 
         return formatted_content, word_count, estimated_tokens
@@ -181,24 +307,60 @@ def process_file(file_path: pathlib.Path, path_format: str, max_tokens_doc: int)
         return error_message, 0, 0
 
 
+def _process_text_file(
+    file_path: pathlib.Path, path_format: str, max_tokens_doc: int
+) -> Optional[Tuple[str, int, int]]:
+    """Run process_file on a text file; return None for binary files."""
+    if is_binary_file(file_path):
+        return None
+    return process_file(file_path, path_format, max_tokens_doc)
+
+
+def process_files(
+    file_paths: Sequence[pathlib.Path], path_format: str, max_tokens_doc: int
+) -> List[Optional[Tuple[str, int, int]]]:
+    """
+    Binary-check and process many files, overlapping their reads.
+
+    Small batches run serially; larger ones go through a thread pool so the
+    open/read syscalls of many small files overlap (reads release the GIL).
+
+    Args:
+        file_paths: Files to process.
+        path_format: How the path should be formatted ('full', 'relative', 'name_only').
+        max_tokens_doc: Maximum estimated tokens per file.
+
+    Returns:
+        One entry per input path, in order: the process_file result, or None
+        if the file is binary.
+    """
+    if len(file_paths) < _PARALLEL_READ_MIN_FILES:
+        return [_process_text_file(p, path_format, max_tokens_doc) for p in file_paths]
+
+    with ThreadPoolExecutor(max_workers=_PARALLEL_READ_WORKERS) as executor:
+        return list(executor.map(
+            lambda p: _process_text_file(p, path_format, max_tokens_doc), file_paths
+        ))
+
+
 def estimate_file_tokens(file_path: pathlib.Path) -> int:
     """
     Estimate the number of tokens in a file.
 
-    Uses the approximation of ~4 characters per token.
+    Uses the approximation of ~4 bytes per token, taking the size from file
+    metadata so the content is never read.
 
     Args:
         file_path: Path to the file
 
     Returns:
-        Estimated token count
+        Estimated token count, 0 for anything but a readable regular file
     """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        return len(content) // 4
-    except Exception:
+        st = os.stat(file_path)
+    except OSError:
         return 0
+    return st.st_size >> 2 if stat.S_ISREG(st.st_mode) else 0
 
 
 def get_directory_files(
@@ -2,8 +2,9 @@
 
 Provides common git operations used across multiple commands.
 """
+import os
 import subprocess
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from ab_cli.utils.exceptions import GitError
 
@@ -18,25 +19,53 @@ def run_git(*args, capture: bool = True, check: bool = True) -> subprocess.Compl
 
     Returns:
         CompletedProcess instance with stdout/stderr
+
+    Output is captured as bytes and decoded once as UTF-8 (invalid bytes
+    become U+FFFD). Unlike text mode, line endings are passed through
+    untranslated, so CRLF content in diffs is kept as-is.
+
+    Git never starts a pager, and captured output is never colored, even
+    if the user's config sets color.ui=always.
     """
-    cmd = ['git'] + list(args)
-    return subprocess.run(
-        cmd,
-        capture_output=capture,
-        text=True,
-        encoding='utf-8',
-        errors='replace',
-        check=check
-    )
+    cmd = ['git', '--no-pager']
+    if capture:
+        cmd += ['-c', 'color.ui=never']
+    cmd.extend(args)
+    result = subprocess.run(cmd, capture_output=capture)
+    result.stdout = _decode_output(result.stdout)
+    result.stderr = _decode_output(result.stderr)
+    if check:
+        result.check_returncode()
+    return result
+
+
+def _decode_output(data: Optional[bytes]) -> Optional[str]:
+    """Decode captured git output; None (not captured) passes through."""
+    if isinstance(data, bytes):
+        return data.decode('utf-8', errors='replace')
+    return data
+
+
+# Working directories already found to be inside a git repository
+_git_repo_dirs: Set[str] = set()
 
 
 def is_git_repo() -> bool:
-    """Check if current directory is inside a git repository."""
+    """Check if current directory is inside a git repository.
+
+    Positive answers are cached per working directory, so repeated checks in
+    the same process do not spawn git again. Negative answers are not: a
+    later git init or clone into the directory is picked up.
+    """
+    cwd = os.getcwd()
+    if cwd in _git_repo_dirs:
+        return True
     try:
         run_git('rev-parse', '--is-inside-work-tree')
-        return True
     except subprocess.CalledProcessError:
         return False
+    _git_repo_dirs.add(cwd)
+    return True
 
 
 def require_git_repo() -> None:
@@ -246,9 +275,9 @@ def get_commit_diff(commit_hash: str) -> str:
 
     if parent_count == 0:
         # First commit - use diff-tree with --root
-        result = run_git('diff-tree', '--root', '-p', commit_hash, check=False)
+        result = run_git('diff-tree', '--root', '-p', '--no-color', commit_hash, check=False)
     else:
-        result = run_git('show', '--format=', '-p', commit_hash, check=False)
+        result = run_git('show', '--format=', '-p', '--no-color', commit_hash, check=False)
 
     return result.stdout
 
@@ -332,14 +361,18 @@ def get_all_tags() -> List[str]:
 # Merge conflict operations
 
 def get_conflicted_files() -> List[str]:
-    """Get list of files with merge conflicts."""
+    """Get list of files with merge conflicts (paths relative to the repo root).
+
+    Reads the unmerged entries straight from the index, so git does not
+    have to stat the working tree the way ``git diff`` does.
+    """
     try:
-        result = run_git('diff', '--name-only', '--diff-filter=U')
-        if result.stdout.strip():
-            return result.stdout.strip().split('\n')
+        result = run_git('ls-files', '--unmerged', '--full-name', '--', ':/')
     except subprocess.CalledProcessError:
-        pass
-    return []
+        return []
+    # One line per conflict stage: "<mode> <sha> <stage>\t<path>"
+    paths = (line.split('\t', 1)[1] for line in result.stdout.splitlines() if '\t' in line)
+    return list(dict.fromkeys(paths))
 
 
 # Base branch detection
@@ -9,13 +9,69 @@ import hashlib
 import json
 import pathlib
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ab_cli.core.config import get_config
 from ab_cli.utils.api import pp
 
 
-def sanitize_sensitive_data(text: str) -> str:
+# Sanitization rules, applied in order: (literal triggers, pattern,
+# replacement, flags). A rule only runs when one of its triggers occurs in
+# the text (casefolded for IGNORECASE rules), which skips most
+# regex scans on ordinary text. The passes stay sequential on purpose:
+# later rules re-scan earlier output, so a wider rule such as
+# [A-Z_]+_API_KEY=\S+ still redacts what a narrower one left behind.
+_SANITIZE_RULES: List[Tuple[Tuple[str, ...], re.Pattern, str]] = [
+    (triggers, re.compile(pattern, flags), replacement)
+    for triggers, pattern, replacement, flags in [
+        # API keys - specific patterns
+        (('api',), r'(api[_-]?key\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]', 0),
+        (('OPENROUTER_API_KEY',), r'(OPENROUTER_API_KEY\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', 0),
+        # OpenAI-style sk- API keys (allow hyphens in key value)
+        (('sk-',), r'(sk-[a-zA-Z0-9-]{20,})', '[REDACTED_API_KEY]', 0),
+        # Custom API keys (e.g., STRIPE_API_KEY=xxx, GITHUB_API_KEY=xxx)
+        (('_API_KEY',), r'([A-Z_]+_API_KEY\s*[=:]\s*)\S+', r'\1[REDACTED]', 0),
+        # Passwords
+        (('password',), r'(password\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        (('passwd',), r'(passwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        (('pwd',), r'(pwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        # Tokens and secrets
+        (('secret',), r'(secret\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        (('token',), r'(token\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        (('auth',), r'(auth\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
+        # OAuth and access tokens
+        (('oauth_token',), r'(oauth_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
+        (('access_token',), r'(access_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
+        # Bearer tokens (comprehensive pattern including base64 chars)
+        (('Bearer',), r'(Bearer\s+)[A-Za-z0-9\-._~+/]+=*', r'\1[REDACTED]', 0),
+        # Basic auth
+        (('Basic',), r'(Basic\s+)[a-zA-Z0-9+/=]{20,}', r'\1[REDACTED]', 0),
+        # Generic secrets pattern (SECRET, PASSWORD, TOKEN, KEY, CREDENTIAL in env vars)
+        (('SECRET', 'PASSWORD', 'TOKEN', 'KEY', 'CREDENTIAL'),
+         r'([A-Z_]*(?:SECRET|PASSWORD|TOKEN|KEY|CREDENTIAL)[A-Z_]*\s*[=:]\s*)\S+', r'\1[REDACTED]', 0),
+    ]
+]
+
+# Every rule needs one of these substrings to match (an = or : separator,
+# an sk- key, an auth scheme, or a PEM header); text with none of them is
+# returned without running any regex.
+_SANITIZE_TRIGGERS = ('=', ':', 'sk-', 'Bearer', 'Basic', '-----BEGIN')
+
+# Private keys (PEM format). Redacted before the other rules so a
+# "PRIVATE_KEY=-----BEGIN ..." assignment cannot consume just the header
+# and leave the key body behind; the lazy .*? stops at the first END line.
+_PEM_RE = re.compile(
+    r'-----BEGIN[A-Z\s]*PRIVATE KEY-----.*?-----END[A-Z\s]*PRIVATE KEY-----',
+    re.DOTALL,
+)
+
+# Webhook URLs (sanitize entire URL - matches "webhook" or "hooks" in URL).
+# Redacted before the key/value rules, which would otherwise claim
+# "webhook_url=..." and leave part of the URL behind.
+_WEBHOOK_RE = re.compile(r'https?://[^\s]*(?:webhook|hooks)[^\s]*', re.IGNORECASE)
+
+
+def sanitize_sensitive_data(text: Optional[str]) -> Optional[str]:
     """
     Sanitize sensitive data from text before saving to history.
 
@@ -27,59 +83,38 @@ def sanitize_sensitive_data(text: str) -> str:
     - Private keys (PEM format)
     - Generic secret patterns
 
+    Private key blocks are removed first, and only when a PEM header is
+    present, so later patterns never see (or partially redact) key bodies.
+    Webhook URLs follow when the text mentions "hook". The precompiled
+    key/value rules then run in sequence, each skipped when none of its
+    literal triggers occurs in the text.
+
     Args:
-        text: The text to sanitize
+        text: The text to sanitize (None and "" are returned unchanged)
 
     Returns:
         Text with sensitive data replaced with [REDACTED] placeholders
     """
-    if not text:
+    if not text or not any(token in text for token in _SANITIZE_TRIGGERS):
         return text
 
-    # Patterns to sanitize (key=value format)
-    patterns = [
-        # API keys - specific patterns
-        (r'(api[_-]?key\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]'),
-        (r'(OPENROUTER_API_KEY\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]'),
-        # OpenAI-style sk- API keys (allow hyphens in key value)
-        (r'(sk-[a-zA-Z0-9-]{20,})', '[REDACTED_API_KEY]'),
-        # Custom API keys (e.g., STRIPE_API_KEY=xxx, GITHUB_API_KEY=xxx)
-        (r'([A-Z_]+_API_KEY\s*[=:]\s*)\S+', r'\1[REDACTED]'),
-        # Passwords
-        (r'(password\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(passwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(pwd\s*[=:]\s*)["\']?[^\s"\']+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        # Tokens and secrets
-        (r'(secret\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(token\s*[=:]\s*)["\']?[\w-]{20,}["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(auth\s*[=:]\s*)["\']?[\w-]+["\']?', r'\1[REDACTED]', re.IGNORECASE),
-        # OAuth and access tokens
-        (r'(oauth_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
-        (r'(access_token\s*[=:]\s*)\S+', r'\1[REDACTED]', re.IGNORECASE),
-        # Bearer tokens (comprehensive pattern including base64 chars)
-        (r'(Bearer\s+)[A-Za-z0-9\-._~+/]+=*', r'\1[REDACTED]'),
-        # Basic auth
-        (r'(Basic\s+)[a-zA-Z0-9+/=]{20,}', r'\1[REDACTED]'),
-        # Webhook URLs (sanitize entire URL - matches "webhook" or "hooks" in URL)
-        (r'https?://[^\s]*(webhook|hooks)[^\s]*', '[REDACTED_WEBHOOK_URL]', re.IGNORECASE),
-        # Private keys (PEM format)
-        (r'-----BEGIN[A-Z\s]*PRIVATE KEY-----[\s\S]*?-----END[A-Z\s]*PRIVATE KEY-----',
-         '[REDACTED_PRIVATE_KEY]'),
-        # Generic secrets pattern (SECRET, PASSWORD, TOKEN, KEY, CREDENTIAL in env vars)
-        (r'([A-Z_]*(SECRET|PASSWORD|TOKEN|KEY|CREDENTIAL)[A-Z_]*\s*[=:]\s*)\S+',
-         r'\1[REDACTED]'),
-    ]
-
-    result = text
-    for pattern_tuple in patterns:
-        if len(pattern_tuple) == 3:
-            pattern, replacement, flags = pattern_tuple
-            result = re.sub(pattern, replacement, result, flags=flags)
-        else:
-            pattern, replacement = pattern_tuple
-            result = re.sub(pattern, replacement, result)
-
-    return result
+    if '-----BEGIN' in text:
+        text = _PEM_RE.sub('[REDACTED_PRIVATE_KEY]', text)
+    # casefold, not lower: IGNORECASE also matches e.g. U+017F (long s)
+    # against "s", and only casefold maps it to its ASCII letter
+    folded = text.casefold()
+    if 'hook' in folded:
+        text = _WEBHOOK_RE.sub('[REDACTED_WEBHOOK_URL]', text)
+        folded = text.casefold()
+
+    for triggers, pattern, replacement in _SANITIZE_RULES:
+        haystack = folded if pattern.flags & re.IGNORECASE else text
+        if not any(trigger in haystack for trigger in triggers):
+            continue
+        text, count = pattern.subn(replacement, text)
+        if count:
+            folded = text.casefold()
+    return text
 
 
 def calculate_estimated_cost(model: str, prompt_tokens: int, response_tokens: int) -> float:
@@ -5,7 +5,7 @@ model selection based on token count.
 """
 from typing import Dict, Optional, Tuple
 
-from ab_cli.core.config import get_config, estimate_tokens
+from ab_cli.core.config import get_config, estimate_tokens_batch
 from ab_cli.core.llm_settings import DEFAULT_REASONING_EFFORT, DEFAULT_SERVICE_TIER
 from ab_cli.utils.api import send_to_openrouter
 
@@ -37,7 +37,7 @@ def call_llm(
     config = get_config()
 
     # Estimate tokens and select appropriate model
-    estimated_tokens = estimate_tokens(prompt + context)
+    estimated_tokens = estimate_tokens_batch((prompt, context))
     selected_model = config.select_model(estimated_tokens)
 
     # Get API settings from config
@@ -89,7 +89,7 @@ def call_llm_with_model_info(
     config = get_config()
 
     # Estimate tokens and select appropriate model
-    estimated_tokens = estimate_tokens(prompt + context)
+    estimated_tokens = estimate_tokens_batch((prompt, context))
     selected_model = config.select_model(estimated_tokens)
 
     # Get API settings from config
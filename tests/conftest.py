@@ -1,9 +1,11 @@
 """Pytest configuration and fixtures for ab-cli tests."""
 import json
+import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -21,7 +23,7 @@ def reset_config_singleton():
     original_instance = config_module.AbConfig._instance
 
     # Reset singleton
-    config_module.AbConfig._instance = None
+    config_module.AbConfig.reset_for_testing()
 
     yield
 
@@ -29,6 +31,16 @@ def reset_config_singleton():
     config_module.AbConfig._instance = original_instance
 
 
+@pytest.fixture(autouse=True)
+def clear_git_repo_cache():
+    """Forget cached is_git_repo answers between tests."""
+    from ab_cli.utils import git_helpers
+
+    git_helpers._git_repo_dirs.clear()
+    yield
+    git_helpers._git_repo_dirs.clear()
+
+
 @pytest.fixture
 def temp_config_dir(tmp_path: Path, monkeypatch) -> Path:
     """Create temporary config directory and patch config paths."""
@@ -48,12 +60,14 @@ def temp_config_dir(tmp_path: Path, monkeypatch) -> Path:
     return config_dir
 
 
-@pytest.fixture
-def mock_config(temp_config_dir: Path) -> Dict[str, Any]:
-    """Create a mock configuration file."""
-    from ab_cli.core import config as config_module
+@pytest.fixture(scope="session")
+def mock_config_data() -> Mapping[str, Any]:
+    """Static mock configuration, built once per session (read-only).
 
-    config_data = {
+    The history directory depends on each test's temp dir, so it is added
+    by mock_config.
+    """
+    return MappingProxyType({
         "version": "1.0",
         "global": {
             "language": "en",
@@ -86,67 +100,104 @@ def mock_config(temp_config_dir: Path) -> Dict[str, Any]:
                 "max_completion_tokens": 16000
             }
         },
+    })
+
+
+@pytest.fixture
+def mock_config(temp_config_dir: Path, mock_config_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Create a mock configuration file.
+
+    Returns a fresh copy of the written data, safe for the test to mutate.
+    """
+    from ab_cli.core import config as config_module
+
+    config_text = json.dumps({
+        **mock_config_data,
         "history": {
             "enabled": True,
             "directory": str(temp_config_dir / "history")
         }
-    }
+    }, indent=2)
+    config_module.AB_CONFIG_FILE.write_text(config_text, encoding="utf-8")
 
-    config_file = config_module.AB_CONFIG_FILE
-    with open(config_file, "w", encoding="utf-8") as f:
-        json.dump(config_data, f, indent=2)
+    return json.loads(config_text)
 
-    return config_data
 
+def _git(repo_dir: Path, *args: str) -> None:
+    """Run a git command in repo_dir, failing the test on error."""
+    subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, check=True)
 
-@pytest.fixture
-def mock_git_repo(tmp_path: Path) -> Path:
-    """Create a mock git repository."""
-    repo_dir = tmp_path / "test_repo"
+
+@pytest.fixture(scope="session")
+def _git_repo_template(tmp_path_factory) -> Path:
+    """Build the mock git repository once per session."""
+    repo_dir = tmp_path_factory.mktemp("repo-template") / "test_repo"
     repo_dir.mkdir()
 
-    # Initialize git repo
-    subprocess.run(
-        ["git", "init"],
-        cwd=repo_dir,
-        capture_output=True,
-        check=True
-    )
-
-    # Configure git user for commits
-    subprocess.run(
-        ["git", "config", "user.email", "test@example.com"],
-        cwd=repo_dir,
-        capture_output=True,
-        check=True
-    )
-    subprocess.run(
-        ["git", "config", "user.name", "Test User"],
-        cwd=repo_dir,
-        capture_output=True,
-        check=True
-    )
+    _git(repo_dir, "init")
+    _git(repo_dir, "config", "user.email", "test@example.com")
+    _git(repo_dir, "config", "user.name", "Test User")
 
     # Create initial commit
     readme = repo_dir / "README.md"
     readme.write_text("# Test Repository\n")
+    _git(repo_dir, "add", "README.md")
+    _git(repo_dir, "commit", "-m", "Initial commit")
+
+    return repo_dir
 
+
+@pytest.fixture(scope="session")
+def _conflicted_git_repo_template(_git_repo_template: Path, tmp_path_factory) -> Path:
+    """Build, once per session, a repository with an unmerged test.txt in its index.
+
+    The three conflict stages are written with git plumbing (hash-object and
+    update-index) instead of committing two branches and merging them.
+    """
+    repo_dir = tmp_path_factory.mktemp("conflict-template") / "test_repo"
+    shutil.copytree(_git_repo_template, repo_dir, symlinks=False)
+
+    stage_dir = tmp_path_factory.mktemp("conflict-stages")
+    stages = ("base content\n", "master content\n", "feature content\n")
+    stage_files = []
+    for number, content in enumerate(stages, 1):
+        stage_file = stage_dir / f"stage{number}"
+        stage_file.write_text(content)
+        stage_files.append(str(stage_file))
+
+    blobs = subprocess.run(
+        ["git", "hash-object", "-w", "--stdin-paths"],
+        cwd=repo_dir, input="\n".join(stage_files) + "\n", text=True, capture_output=True, check=True
+    ).stdout.split()
+    index_info = "".join(f"100644 {blob} {number}\ttest.txt\n" for number, blob in enumerate(blobs, 1))
     subprocess.run(
-        ["git", "add", "README.md"],
-        cwd=repo_dir,
-        capture_output=True,
-        check=True
+        ["git", "update-index", "--index-info"],
+        cwd=repo_dir, input=index_info, text=True, capture_output=True, check=True
     )
-    subprocess.run(
-        ["git", "commit", "-m", "Initial commit"],
-        cwd=repo_dir,
-        capture_output=True,
-        check=True
+
+    (repo_dir / "test.txt").write_text(
+        "<<<<<<< HEAD\nmaster content\n=======\nfeature content\n>>>>>>> feature\n"
     )
 
     return repo_dir
 
 
+@pytest.fixture
+def mock_git_repo(_git_repo_template: Path, tmp_path: Path) -> Path:
+    """Create a mock git repository (a copy of the session template)."""
+    repo_dir = tmp_path / "test_repo"
+    shutil.copytree(_git_repo_template, repo_dir, symlinks=False)
+    return repo_dir
+
+
+@pytest.fixture
+def mock_conflicted_git_repo(_conflicted_git_repo_template: Path, tmp_path: Path) -> Path:
+    """Create a mock git repository with an unresolved merge conflict in test.txt."""
+    repo_dir = tmp_path / "test_repo"
+    shutil.copytree(_conflicted_git_repo_template, repo_dir, symlinks=False)
+    return repo_dir
+
+
 @pytest.fixture
 def mock_subprocess():
     """Mock subprocess.run for git commands."""
@@ -162,17 +213,32 @@ def mock_subprocess():
 @pytest.fixture
 def mock_requests():
     """Mock requests library for API calls."""
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        body = {
             "choices": [{"message": {"content": "Test response"}}],
             "usage": {"prompt_tokens": 100, "completion_tokens": 50}
         }
+        mock_response.json.return_value = body
+        mock_response.content = json.dumps(body).encode()
         mock_post.return_value = mock_response
         yield mock_post
 
 
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """Stub resolve-conflict's call_llm; returns the list of recorded calls."""
+    calls = []
+
+    def fake_call_llm(*args, **kwargs):
+        calls.append((args, kwargs))
+        return {"text": "merged content"}
+
+    monkeypatch.setattr("ab_cli.commands.resolve_conflict.call_llm", fake_call_llm)
+    return calls
+
+
 @pytest.fixture
 def mock_input():
     """Mock user input."""
@@ -107,6 +107,15 @@ class TestGetDirectoryListing:
         result = get_directory_listing()
         assert len(result) <= 1500
 
+    def test_get_directory_listing_marks_directories(self, tmp_path):
+        """Appends a slash to subdirectory names."""
+        (tmp_path / 'subdir').mkdir()
+        (tmp_path / 'file.txt').write_text('content')
+
+        result = get_directory_listing(str(tmp_path))
+        assert 'subdir/' in result.splitlines()
+        assert 'file.txt' in result.splitlines()
+
 
 class TestGetShebang:
     """Tests for get_shebang function."""
@@ -218,37 +227,14 @@ class TestMain:
             captured = capsys.readouterr()
             assert 'failed' in captured.err.lower()
 
-    def test_main_lang_flag_accepted(self, monkeypatch, capsys, mock_config):
-        """Accepts --lang flag."""
-        monkeypatch.setattr(sys, 'argv', ['gen-script', '--lang', 'python', 'test'])
-
-        with patch('ab_cli.commands.gen_script.call_llm_with_model_info') as mock_call:
-            mock_call.return_value = ({'text': 'print("hello")'}, 'test-model', 100)
-
-            try:
-                main()
-            except SystemExit:
-                pass
-
-        # If we got here without argument error, the flag was accepted
-
-    def test_main_type_flag_accepted(self, monkeypatch, capsys, mock_config):
-        """Accepts --type flag."""
-        monkeypatch.setattr(sys, 'argv', ['gen-script', '--type', 'cron', 'test'])
-
-        with patch('ab_cli.commands.gen_script.call_llm_with_model_info') as mock_call:
-            mock_call.return_value = ({'text': 'echo hello'}, 'test-model', 100)
-
-            try:
-                main()
-            except SystemExit:
-                pass
-
-        # If we got here without argument error, the flag was accepted
-
-    def test_main_full_flag_accepted(self, monkeypatch, capsys, mock_config):
-        """Accepts --full flag."""
-        monkeypatch.setattr(sys, 'argv', ['gen-script', '--full', 'test'])
+    @pytest.mark.parametrize("flags", [
+        ['--lang', 'python'],
+        ['--type', 'cron'],
+        ['--full'],
+    ], ids=['lang', 'type', 'full'])
+    def test_main_flag_accepted(self, monkeypatch, mock_config, flags):
+        """Accepts --lang, --type and --full flags."""
+        monkeypatch.setattr(sys, 'argv', ['gen-script', *flags, 'test'])
 
         with patch('ab_cli.commands.gen_script.call_llm_with_model_info') as mock_call:
             mock_call.return_value = ({'text': 'echo hello'}, 'test-model', 100)
@@ -260,7 +246,7 @@ class TestMain:
 
         # If we got here without argument error, the flag was accepted
 
-    def test_main_output_flag_creates_file(self, tmp_path, monkeypatch, capsys, mock_config):
+    def test_main_output_flag_creates_file(self, tmp_path, monkeypatch, mock_config):
         """--output flag creates executable file."""
         output_file = tmp_path / 'test_script.sh'
         monkeypatch.setattr(sys, 'argv', ['gen-script', '-o', str(output_file), 'test'])
@@ -277,7 +263,7 @@ class TestMain:
         if output_file.exists():
             assert os.access(output_file, os.X_OK)
 
-    def test_main_generates_script_with_context(self, monkeypatch, capsys, mock_config):
+    def test_main_generates_script_with_context(self, monkeypatch, mock_config):
         """Generates script with system context."""
         monkeypatch.setattr(sys, 'argv', ['gen-script', 'list files'])
 
@@ -295,7 +281,7 @@ class TestMain:
                 # Verify call_llm_with_model_info was called
                 assert mock_call.called
 
-    def test_main_run_flag_executes_script(self, tmp_path, monkeypatch, capsys, mock_config):
+    def test_main_run_flag_executes_script(self, tmp_path, monkeypatch, mock_config):
         """--run flag executes the generated script."""
         monkeypatch.chdir(tmp_path)
         monkeypatch.setattr(sys, 'argv', ['gen-script', '--run', 'echo hello'])
@@ -335,7 +321,7 @@ class TestMain:
                 _ = capsys.readouterr()
                 # Should handle non-zero exit gracefully
 
-    def test_main_run_flag_python_script(self, tmp_path, monkeypatch, capsys, mock_config):
+    def test_main_run_flag_python_script(self, tmp_path, monkeypatch, mock_config):
         """--run flag executes Python scripts correctly."""
         monkeypatch.chdir(tmp_path)
         monkeypatch.setattr(sys, 'argv', ['gen-script', '--lang', 'python', '--run', 'print hello'])
@@ -355,7 +341,7 @@ class TestMain:
                 run_calls = [c for c in mock_run.call_args_list if len(c[0][0]) > 0 and c[0][0][0] == 'python3']
                 assert len(run_calls) > 0 or mock_run.called
 
-    def test_main_special_characters_in_description(self, monkeypatch, capsys, mock_config):
+    def test_main_special_characters_in_description(self, monkeypatch, mock_config):
         """Handles special characters in task description."""
         monkeypatch.setattr(sys, 'argv', ['gen-script', "list files with 'quotes' and $variables"])
 
@@ -370,7 +356,7 @@ class TestMain:
             # Verify the call was made successfully
             assert mock_call.called
 
-    def test_main_unicode_in_description(self, monkeypatch, capsys, mock_config):
+    def test_main_unicode_in_description(self, monkeypatch, mock_config):
         """Handles unicode characters in task description."""
         monkeypatch.setattr(sys, 'argv', ['gen-script', 'find files with émojis 🎉 and 中文'])
 
@@ -384,7 +370,7 @@ class TestMain:
 
             assert mock_call.called
 
-    def test_main_multiline_description(self, monkeypatch, capsys, mock_config):
+    def test_main_multiline_description(self, monkeypatch, mock_config):
         """Handles multiline task descriptions."""
         description = """create a script that:
 1. reads a file
@@ -1,7 +1,4 @@
 """Integration tests for ab_cli.commands.resolve_conflict module."""
-import subprocess
-import sys
-from unittest.mock import patch
 
 import pytest
 
@@ -15,6 +12,13 @@ from ab_cli.commands.resolve_conflict import (
     parse_conflicts,
 )
 
+# A single conflict with 50 lines on each side
+_LONG_OURS_LINES = [f'    line_ours_{i} = "value_{i}"' for i in range(50)]
+_LONG_THEIRS_LINES = [f'    line_theirs_{i} = "different_{i}"' for i in range(50)]
+_LONG_CONFLICT_CONTENT = '\n'.join(
+    ['<<<<<<< HEAD', *_LONG_OURS_LINES, '=======', *_LONG_THEIRS_LINES, '>>>>>>> feature']
+)
+
 
 class TestIsGitRepo:
     """Tests for is_git_repo function."""
@@ -39,25 +43,9 @@ class TestGetConflictedFiles:
         result = get_conflicted_files()
         assert result == []
 
-    def test_get_conflicted_files_with_conflict(self, mock_git_repo, monkeypatch):
+    def test_get_conflicted_files_with_conflict(self, mock_conflicted_git_repo, monkeypatch):
         """Returns list of conflicted files."""
-        monkeypatch.chdir(mock_git_repo)
-
-        # Create a conflict scenario
-        # Create a branch and modify a file
-        subprocess.run(['git', 'checkout', '-b', 'feature'], cwd=mock_git_repo, check=True)
-        (mock_git_repo / 'test.txt').write_text('feature content\n')
-        subprocess.run(['git', 'add', '.'], cwd=mock_git_repo, check=True)
-        subprocess.run(['git', 'commit', '-m', 'feature change'], cwd=mock_git_repo, check=True)
-
-        # Go back to master and make conflicting change
-        subprocess.run(['git', 'checkout', 'master'], cwd=mock_git_repo, check=True)
-        (mock_git_repo / 'test.txt').write_text('master content\n')
-        subprocess.run(['git', 'add', '.'], cwd=mock_git_repo, check=True)
-        subprocess.run(['git', 'commit', '-m', 'master change'], cwd=mock_git_repo, check=True)
-
-        # Try to merge (will conflict)
-        subprocess.run(['git', 'merge', 'feature'], cwd=mock_git_repo, check=False)
+        monkeypatch.chdir(mock_conflicted_git_repo)
 
         result = get_conflicted_files()
         assert 'test.txt' in result
@@ -66,53 +54,46 @@ class TestGetConflictedFiles:
 class TestHasConflictMarkers:
     """Tests for has_conflict_markers function."""
 
-    def test_has_conflict_markers_true(self):
-        """Returns True when conflict markers present."""
-        content = '''some code
+    @pytest.mark.parametrize("content,expected", [
+        pytest.param('''some code
 <<<<<<< HEAD
 master version
 =======
 feature version
 >>>>>>> feature
-more code'''
-        assert has_conflict_markers(content) is True
-
-    def test_has_conflict_markers_false(self):
-        """Returns False when no conflict markers."""
-        content = '''normal code
+more code''', True, id="complete"),
+        pytest.param('''normal code
 without any conflict markers
-just regular content'''
-        assert has_conflict_markers(content) is False
-
-    def test_has_conflict_markers_partial(self):
-        """Returns False when only partial markers."""
+just regular content''', False, id="no-markers"),
         # Only has <<<<<<< but not ======= and >>>>>>>
-        content = '''<<<<<<< HEAD
-some content'''
-        assert has_conflict_markers(content) is False
+        pytest.param('''<<<<<<< HEAD
+some content''', False, id="partial"),
+        pytest.param('''>>>>>>> feature
+=======
+<<<<<<< HEAD''', False, id="out-of-order"),
+        # Text that mentions a marker but has no complete block
+        pytest.param('''Some text about git:
+The <<<<<<< marker indicates the start
+But without all three markers, no conflict exists
+''', False, id="marker-in-prose"),
+    ])
+    def test_has_conflict_markers(self, content, expected):
+        """Detects only complete, ordered conflict blocks."""
+        assert has_conflict_markers(content) is expected
 
 
 class TestParseConflicts:
     """Tests for parse_conflicts function."""
 
-    def test_parse_conflicts_single(self):
-        """Parses single conflict correctly."""
-        content = '''line1
+    @pytest.mark.parametrize("content,expected", [
+        pytest.param('''line1
 <<<<<<< HEAD
 master version
 =======
 feature version
 >>>>>>> feature
-line2'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 1
-        assert conflicts[0]['ours'] == ['master version']
-        assert conflicts[0]['theirs'] == ['feature version']
-
-    def test_parse_conflicts_multiple(self):
-        """Parses multiple conflicts correctly."""
-        content = '''line1
+line2''', [(['master version'], ['feature version'])], id="single"),
+        pytest.param('''line1
 <<<<<<< HEAD
 master 1
 =======
@@ -124,34 +105,94 @@ master 2
 =======
 feature 2
 >>>>>>> feature
-line3'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 2
-        assert conflicts[0]['ours'] == ['master 1']
-        assert conflicts[1]['ours'] == ['master 2']
-
-    def test_parse_conflicts_multiline(self):
-        """Parses multi-line conflict sections."""
-        content = '''<<<<<<< HEAD
+line3''', [(['master 1'], ['feature 1']), (['master 2'], ['feature 2'])], id="multiple"),
+        pytest.param('''<<<<<<< HEAD
 line1
 line2
 line3
 =======
 alt1
 alt2
->>>>>>> feature'''
-        conflicts = parse_conflicts(content)
+>>>>>>> feature''', [(['line1', 'line2', 'line3'], ['alt1', 'alt2'])], id="multiline"),
+        pytest.param('normal content without conflicts', [], id="empty"),
+        # Multiple interleaved blocks; the second one has an extra line on their side
+        pytest.param('''import os
+import sys
 
-        assert len(conflicts) == 1
-        assert conflicts[0]['ours'] == ['line1', 'line2', 'line3']
-        assert conflicts[0]['theirs'] == ['alt1', 'alt2']
+<<<<<<< HEAD
+def process_data(data):
+    """Process data using method A."""
+    return data.upper()
+=======
+def process_data(data):
+    """Process data using method B."""
+    return data.lower()
+>>>>>>> feature-branch
+
+class Handler:
+<<<<<<< HEAD
+    def __init__(self):
+        self.mode = "production"
+=======
+    def __init__(self):
+        self.mode = "development"
+        self.debug = True
+>>>>>>> feature-branch
 
-    def test_parse_conflicts_empty(self):
-        """Returns empty list for no conflicts."""
-        content = 'normal content without conflicts'
+    def run(self):
+<<<<<<< HEAD
+        return self.process()
+=======
+        return self.execute()
+>>>>>>> feature-branch
+''', [
+            (['def process_data(data):', '    """Process data using method A."""', '    return data.upper()'],
+             ['def process_data(data):', '    """Process data using method B."""', '    return data.lower()']),
+            (['    def __init__(self):', '        self.mode = "production"'],
+             ['    def __init__(self):', '        self.mode = "development"', '        self.debug = True']),
+            (['        return self.process()'], ['        return self.execute()']),
+        ], id="complex-multiblock"),
+        pytest.param('''<<<<<<< HEAD
+function getData() {
+    return {
+        name: "test",
+        config: {
+            enabled: true,
+            options: [1, 2, 3]
+        }
+    };
+}
+=======
+function getData() {
+    return {
+        name: "test",
+        config: {
+            enabled: false,
+            options: []
+        }
+    };
+}
+>>>>>>> feature''', [(
+            ['function getData() {', '    return {', '        name: "test",', '        config: {',
+             '            enabled: true,', '            options: [1, 2, 3]', '        }', '    };', '}'],
+            ['function getData() {', '    return {', '        name: "test",', '        config: {',
+             '            enabled: false,', '            options: []', '        }', '    };', '}'],
+        )], id="nested-braces"),
+        # One side deleted the code
+        pytest.param('''<<<<<<< HEAD
+=======
+def new_function():
+    pass
+>>>>>>> feature''', [([], ['def new_function():', '    pass'])], id="empty-side"),
+        pytest.param('''<<<<<<< HEAD
+=======
+>>>>>>> feature''', [([], [])], id="both-empty"),
+        pytest.param(_LONG_CONFLICT_CONTENT, [(_LONG_OURS_LINES, _LONG_THEIRS_LINES)], id="long-content"),
+    ])
+    def test_parse_conflicts(self, content, expected):
+        """Extracts both sides of every conflict block, in order."""
         conflicts = parse_conflicts(content)
-        assert conflicts == []
+        assert [(c['ours'], c['theirs']) for c in conflicts] == expected
 
 
 class TestGetFileContext:
@@ -175,6 +216,16 @@ class TestGetFileContext:
         # Should have lines after the conflict
         assert 'line18' in after or 'line19' in after
 
+    def test_get_file_context_exact_window(self, tmp_path):
+        """Returns exactly context_lines lines on each side."""
+        test_file = tmp_path / 'test.txt'
+        test_file.write_text(''.join(f'line{i}\n' for i in range(1, 1001)))
+
+        before, after = get_file_context(str(test_file), {'start_line': 15, 'end_line': 17}, context_lines=2)
+
+        assert before == 'line13\nline14\n'
+        assert after == 'line18\nline19\n'
+
     def test_get_file_context_nonexistent(self):
         """Returns empty strings for nonexistent file."""
         conflict = {'start_line': 5, 'end_line': 10}
@@ -213,7 +264,19 @@ line2
         assert 'line1' in content
         assert 'line2' in content
 
-    def test_apply_resolution_nonexistent_fails(self, tmp_path, capsys):
+    def test_apply_resolution_keeps_mode_and_leaves_no_temp_file(self, tmp_path):
+        """Replaces the file atomically, keeping its permissions."""
+        test_file = tmp_path / 'script.sh'
+        test_file.write_text('#!/bin/sh\n<<<<<<< HEAD\na\n=======\nb\n>>>>>>> feature\n')
+        test_file.chmod(0o755)
+
+        assert apply_resolution(str(test_file), {'start_line': 2, 'end_line': 6}, 'echo merged') is True
+
+        assert test_file.read_text() == '#!/bin/sh\necho merged\n'
+        assert test_file.stat().st_mode & 0o777 == 0o755
+        assert [p.name for p in tmp_path.iterdir()] == ['script.sh']
+
+    def test_apply_resolution_nonexistent_fails(self, tmp_path):
         """Returns False for nonexistent file."""
         conflict = {'start_line': 1, 'end_line': 5}
         result = apply_resolution(str(tmp_path / 'nonexistent.txt'), conflict, 'content')
@@ -226,50 +289,27 @@ class TestMain:
     def test_main_not_git_repo_exits_1(self, tmp_path, monkeypatch, capsys):
         """Exits with error when not in git repo."""
         monkeypatch.chdir(tmp_path)
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict'])
 
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        assert exc_info.value.code == 1
+        assert main([]) == 1
         captured = capsys.readouterr()
         assert 'not inside a git repository' in captured.err.lower()
 
-    def test_main_no_conflicts_exits_0(self, mock_git_repo, monkeypatch, capsys, mock_config):
-        """Exits cleanly when no conflicts."""
+    @pytest.mark.parametrize("argv,expected_code,expected_message", [
+        pytest.param([], 0, 'no conflicted files', id="no-conflicts"),
+        pytest.param(['--dry-run'], 0, 'no conflicted files', id="dry-run"),
+        pytest.param(['-y'], 0, 'no conflicted files', id="yes"),
+        pytest.param(['nonexistent.txt'], 1, 'file not found', id="file-not-found"),
+    ])
+    def test_main_exit_codes(self, mock_git_repo, monkeypatch, capsys, mock_config,
+                             argv, expected_code, expected_message):
+        """Returns the exit code and message for runs with nothing to resolve."""
         monkeypatch.chdir(mock_git_repo)
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict'])
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
 
-        assert exc_info.value.code == 0
+        assert main(argv) == expected_code
         captured = capsys.readouterr()
-        assert 'no conflicted files' in captured.out.lower()
+        assert expected_message in (captured.out + captured.err).lower()
 
-    def test_main_dry_run_flag_accepted(self, mock_git_repo, monkeypatch, capsys, mock_config):
-        """Accepts --dry-run flag."""
-        monkeypatch.chdir(mock_git_repo)
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict', '--dry-run'])
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        # Should exit 0 (no conflicts to process)
-        assert exc_info.value.code == 0
-
-    def test_main_yes_flag_accepted(self, mock_git_repo, monkeypatch, capsys, mock_config):
-        """Accepts -y flag."""
-        monkeypatch.chdir(mock_git_repo)
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict', '-y'])
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        # Should exit 0 (no conflicts to process)
-        assert exc_info.value.code == 0
-
-    def test_main_specific_file(self, mock_git_repo, monkeypatch, capsys, mock_config):
+    def test_main_specific_file(self, mock_git_repo, monkeypatch, capsys, mock_config, mock_llm):
         """Accepts specific file argument."""
         monkeypatch.chdir(mock_git_repo)
 
@@ -282,35 +322,12 @@ feature
 >>>>>>> feature
 ''')
 
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict', str(conflict_file)])
-
-        with patch('ab_cli.commands.resolve_conflict.call_llm') as mock_call:
-            mock_call.return_value = {'text': 'merged content'}
-
-            # Use --dry-run to avoid applying changes
-            monkeypatch.setattr(sys, 'argv', ['resolve-conflict', '--dry-run', str(conflict_file)])
-
-            try:
-                main()
-            except SystemExit:
-                pass
+        # Use --dry-run to avoid applying changes
+        assert main(['--dry-run', str(conflict_file)]) == 0
+        assert 'merged content' in capsys.readouterr().out
 
-        # If we got here without argument error, the argument was accepted
-
-    def test_main_file_not_found_exits_1(self, mock_git_repo, monkeypatch, capsys, mock_config):
-        """Exits with error when specified file not found."""
-        monkeypatch.chdir(mock_git_repo)
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict', 'nonexistent.txt'])
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert 'not found' in captured.err.lower()
-
-    def test_main_processes_conflict(self, mock_git_repo, monkeypatch, capsys, mock_config):
-        """Processes conflict file and calls resolve_conflict."""
+    def test_main_processes_conflict(self, mock_git_repo, monkeypatch, mock_config, mock_llm):
+        """Processes conflict file and asks the LLM for a resolution."""
         monkeypatch.chdir(mock_git_repo)
 
         # Create a file with conflict markers
@@ -322,161 +339,17 @@ feature
 >>>>>>> feature
 ''')
 
-        monkeypatch.setattr(sys, 'argv', ['resolve-conflict', '--dry-run', str(conflict_file)])
+        assert main(['--dry-run', str(conflict_file)]) == 0
 
-        with patch('ab_cli.commands.resolve_conflict.resolve_conflict_with_llm') as mock_resolve:
-            mock_resolve.return_value = 'merged content'
-
-            try:
-                main()
-            except SystemExit:
-                pass
-
-            # Verify resolve_conflict_with_llm was called
-            assert mock_resolve.called
+        # One conflict, one LLM call carrying both versions
+        assert len(mock_llm) == 1
+        prompt_text = mock_llm[0][0][0]
+        assert 'master' in prompt_text and 'feature' in prompt_text
 
 
 class TestComplexConflicts:
     """Tests for complex multi-conflict scenarios."""
 
-    def test_parse_conflicts_with_complex_multiblock(self):
-        """Parses file with multiple interleaved conflict blocks."""
-        content = '''import os
-import sys
-
-<<<<<<< HEAD
-def process_data(data):
-    """Process data using method A."""
-    return data.upper()
-=======
-def process_data(data):
-    """Process data using method B."""
-    return data.lower()
->>>>>>> feature-branch
-
-class Handler:
-<<<<<<< HEAD
-    def __init__(self):
-        self.mode = "production"
-=======
-    def __init__(self):
-        self.mode = "development"
-        self.debug = True
->>>>>>> feature-branch
-
-    def run(self):
-<<<<<<< HEAD
-        return self.process()
-=======
-        return self.execute()
->>>>>>> feature-branch
-'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 3
-
-        # First conflict - function definition
-        assert 'process_data' in '\n'.join(conflicts[0]['ours'])
-        assert 'method A' in '\n'.join(conflicts[0]['ours'])
-        assert 'method B' in '\n'.join(conflicts[0]['theirs'])
-
-        # Second conflict - class init
-        assert 'production' in '\n'.join(conflicts[1]['ours'])
-        assert 'development' in '\n'.join(conflicts[1]['theirs'])
-        assert len(conflicts[1]['theirs']) > len(conflicts[1]['ours'])  # theirs has extra line
-
-        # Third conflict - method
-        assert 'process' in '\n'.join(conflicts[2]['ours'])
-        assert 'execute' in '\n'.join(conflicts[2]['theirs'])
-
-    def test_parse_conflicts_nested_braces(self):
-        """Handles conflicts with nested braces and complex syntax."""
-        content = '''<<<<<<< HEAD
-function getData() {
-    return {
-        name: "test",
-        config: {
-            enabled: true,
-            options: [1, 2, 3]
-        }
-    };
-}
-=======
-function getData() {
-    return {
-        name: "test",
-        config: {
-            enabled: false,
-            options: []
-        }
-    };
-}
->>>>>>> feature'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 1
-        assert 'enabled: true' in '\n'.join(conflicts[0]['ours'])
-        assert 'enabled: false' in '\n'.join(conflicts[0]['theirs'])
-
-    def test_parse_conflicts_empty_side(self):
-        """Handles conflicts where one side is empty (deletion)."""
-        content = '''<<<<<<< HEAD
-=======
-def new_function():
-    pass
->>>>>>> feature'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 1
-        assert len(conflicts[0]['ours']) == 0
-        assert len(conflicts[0]['theirs']) > 0
-
-    def test_parse_conflicts_both_empty(self):
-        """Handles conflicts where both sides are effectively empty."""
-        content = '''<<<<<<< HEAD
-=======
->>>>>>> feature'''
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 1
-        assert len(conflicts[0]['ours']) == 0
-        assert len(conflicts[0]['theirs']) == 0
-
-    def test_parse_conflicts_long_content(self):
-        """Handles conflicts with many lines of code."""
-        # Create a conflict with 50 lines on each side
-        ours_lines = [f'    line_ours_{i} = "value_{i}"' for i in range(50)]
-        theirs_lines = [f'    line_theirs_{i} = "different_{i}"' for i in range(50)]
-
-        content = f'''<<<<<<< HEAD
-{chr(10).join(ours_lines)}
-=======
-{chr(10).join(theirs_lines)}
->>>>>>> feature'''
-
-        conflicts = parse_conflicts(content)
-
-        assert len(conflicts) == 1
-        assert len(conflicts[0]['ours']) == 50
-        assert len(conflicts[0]['theirs']) == 50
-
-    def test_has_conflict_markers_mixed_content(self):
-        """Detects conflict markers in mixed content."""
-        # Content with text that looks like markers but isn't complete
-        content_no_conflict = '''Some text about git:
-The <<<<<<< marker indicates the start
-But without all three markers, no conflict exists
-'''
-        assert has_conflict_markers(content_no_conflict) is False
-
-        # Content with all three markers
-        content_with_conflict = '''<<<<<<< HEAD
-version A
-=======
-version B
->>>>>>> branch'''
-        assert has_conflict_markers(content_with_conflict) is True
-
     def test_get_file_context_at_file_start(self, tmp_path):
         """Gets context when conflict is at file start."""
         test_file = tmp_path / 'test.txt'
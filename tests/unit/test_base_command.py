@@ -57,18 +57,18 @@ class ExitCodeCommand(CliCommand):
         return args.code
 
 
+@pytest.fixture(scope="module")
+def example_cmd() -> ExampleCommand:
+    """One ExampleCommand shared by the module; parsing does not mutate it."""
+    return ExampleCommand()
+
+
 class TestCliCommandImport:
     """Tests for CliCommand import accessibility."""
 
-    def test_import_from_core(self):
-        """CliCommand can be imported from ab_cli.core."""
-        from ab_cli.core import CliCommand as ImportedClass
-        assert ImportedClass is CliCommandDirect
-
-    def test_import_from_base_command(self):
-        """CliCommand can be imported from ab_cli.core.base_command."""
-        from ab_cli.core.base_command import CliCommand as DirectImport
-        assert DirectImport is CliCommandDirect
+    def test_core_reexports_base_command_class(self):
+        """ab_cli.core re-exports CliCommand from ab_cli.core.base_command."""
+        assert CliCommand is CliCommandDirect
 
 
 class TestCliCommandAbstract:
@@ -111,40 +111,74 @@ class TestCliCommandAbstract:
 class TestCliCommandInit:
     """Tests for CliCommand initialization."""
 
-    def test_parser_created(self):
+    def test_parser_created(self, example_cmd):
         """Command creates ArgumentParser on init."""
-        cmd = ExampleCommand()
-        assert isinstance(cmd.parser, argparse.ArgumentParser)
+        assert isinstance(example_cmd.parser, argparse.ArgumentParser)
 
-    def test_parser_has_description(self):
+    def test_parser_has_description(self, example_cmd):
         """Parser has the correct description."""
-        cmd = ExampleCommand()
-        assert cmd.parser.description == "Example command for testing"
+        assert example_cmd.parser.description == "Example command for testing"
 
-    def test_arguments_are_setup(self):
+    def test_arguments_are_setup(self, example_cmd):
         """Arguments are configured during init."""
-        cmd = ExampleCommand()
         # Parse to verify arguments exist
-        args = cmd.parse_input(['--verbose', 'test.txt'])
+        args = example_cmd.parse_input(['--verbose', 'test.txt'])
         assert args.verbose is True
         assert args.input == 'test.txt'
 
 
+class TestCliCommandParserSharing:
+    """Tests for the per-subclass parser cache."""
+
+    def test_parser_not_shared_by_default(self):
+        """Without opting in, every instance builds its own parser."""
+        first, second = ExitCodeCommand(), ExitCodeCommand()
+        assert first.parser is not second.parser
+        assert second.parse_input(['--code', '3']).code == 3
+
+    def test_instances_share_parser(self):
+        """share_parser = True reuses the parser built for the first instance."""
+        class SharedCommand(ExitCodeCommand):
+            share_parser = True
+
+        assert SharedCommand().parser is SharedCommand().parser
+
+    def test_subclasses_do_not_share_parser(self):
+        """Each opted-in subclass builds its own parser."""
+        class SharedExample(ExampleCommand):
+            share_parser = True
+
+        class SharedExitCode(ExitCodeCommand):
+            share_parser = True
+
+        assert SharedExample().parser is not SharedExitCode().parser
+
+    def test_arguments_added_after_init(self):
+        """Subclasses may extend the parser after super().__init__()."""
+        class ExtendedCommand(ExitCodeCommand):
+            def __init__(self):
+                super().__init__()
+                self.parser.add_argument('--extra', action='store_true')
+
+        ExtendedCommand()
+        args = ExtendedCommand().parse_input(['--extra', '--code', '2'])
+        assert args.extra is True
+        assert args.code == 2
+
+
 class TestCliCommandParseInput:
     """Tests for CliCommand.parse_input() method."""
 
-    def test_parse_input_with_args(self):
+    def test_parse_input_with_args(self, example_cmd):
         """parse_input correctly parses provided arguments."""
-        cmd = ExampleCommand()
-        args = cmd.parse_input(['--verbose', '-o', 'out.txt', 'input.txt'])
+        args = example_cmd.parse_input(['--verbose', '-o', 'out.txt', 'input.txt'])
         assert args.verbose is True
         assert args.output == 'out.txt'
         assert args.input == 'input.txt'
 
-    def test_parse_input_empty_args(self):
+    def test_parse_input_empty_args(self, example_cmd):
         """parse_input handles empty argument list."""
-        cmd = ExampleCommand()
-        args = cmd.parse_input([])
+        args = example_cmd.parse_input([])
         assert args.verbose is False
         assert args.output is None
         assert args.input is None
@@ -166,11 +200,10 @@ class TestCliCommandExecute:
         result = cmd.execute(args)
         assert result == 42
 
-    def test_execute_success(self, capsys):
+    def test_execute_success(self, example_cmd, capsys):
         """execute performs command logic."""
-        cmd = ExampleCommand()
-        args = cmd.parse_input(['--verbose', 'test.txt'])
-        result = cmd.execute(args)
+        args = example_cmd.parse_input(['--verbose', 'test.txt'])
+        result = example_cmd.execute(args)
 
         captured = capsys.readouterr()
         assert result == 0
@@ -181,10 +214,9 @@ class TestCliCommandExecute:
 class TestCliCommandRun:
     """Tests for CliCommand.run() method."""
 
-    def test_run_returns_success(self):
+    def test_run_returns_success(self, example_cmd):
         """run returns 0 on success."""
-        cmd = ExampleCommand()
-        result = cmd.run(['input.txt'])
+        result = example_cmd.run(['input.txt'])
         assert result == 0
 
     def test_run_returns_custom_exit_code(self):
@@ -216,39 +248,35 @@ class TestCliCommandRun:
         assert result == 130
         assert "Operation cancelled" in captured.out
 
-    def test_run_handles_system_exit(self):
+    def test_run_handles_system_exit(self, example_cmd):
         """run handles SystemExit from argparse (e.g., --help)."""
-        cmd = ExampleCommand()
         # Invalid argument should cause argparse to exit
-        result = cmd.run(['--invalid-flag'])
+        result = example_cmd.run(['--invalid-flag'])
         assert result != 0  # Non-zero exit code
 
-    def test_run_with_none_uses_empty_list(self):
+    def test_run_with_none_uses_empty_list(self, example_cmd):
         """run with None as args parses empty list."""
-        cmd = ExampleCommand()
         # This should work without errors when args is None
         # (argparse will use sys.argv by default)
         with patch.object(sys, 'argv', ['test']):
-            result = cmd.run(None)
+            result = example_cmd.run(None)
             assert result == 0
 
 
 class TestCliCommandHelp:
     """Tests for help text and parser configuration."""
 
-    def test_help_includes_description(self, capsys):
+    def test_help_includes_description(self, example_cmd, capsys):
         """--help includes command description."""
-        cmd = ExampleCommand()
-        result = cmd.run(['--help'])
+        result = example_cmd.run(['--help'])
 
         captured = capsys.readouterr()
         assert result == 0
         assert "Example command for testing" in captured.out
 
-    def test_help_includes_arguments(self, capsys):
+    def test_help_includes_arguments(self, example_cmd, capsys):
         """--help includes argument help text."""
-        cmd = ExampleCommand()
-        cmd.run(['--help'])
+        example_cmd.run(['--help'])
 
         captured = capsys.readouterr()
         assert "--verbose" in captured.out
@@ -1,5 +1,6 @@
 """Unit tests for ab_cli.core.config module."""
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -14,6 +15,7 @@ from ab_cli.core.config import (
     ModelsConfigModel,
     ThresholdsModel,
     estimate_tokens,
+    estimate_tokens_batch,
     get_config,
     get_default_model,
     get_language,
@@ -36,6 +38,19 @@ class TestAbConfigSingleton:
         config2 = get_config()
         assert config1 is config2
 
+    def test_reset_for_testing_drops_instance(self, temp_config_dir):
+        """reset_for_testing() makes the next call build a new instance."""
+        config = get_config()
+        AbConfig.reset_for_testing()
+        assert get_config() is not config
+
+    def test_instance_has_no_dict(self, temp_config_dir):
+        """AbConfig uses __slots__, so unknown attributes are rejected."""
+        config = get_config()
+        assert not hasattr(config, "__dict__")
+        with pytest.raises(AttributeError):
+            config.unknown_setting = 1
+
 
 class TestAbConfigGet:
     """Tests for AbConfig.get() method."""
@@ -77,6 +92,53 @@ class TestAbConfigGet:
         # No config file exists, should fall back to defaults
         assert config.get_with_default("global.language") == DEFAULT_CONFIG["global"]["language"]
 
+    def test_get_subtree_returns_dict(self, mock_config):
+        """Paths to a section return the whole section."""
+        config = get_config()
+        assert config.get("models.thresholds") == mock_config["models"]["thresholds"]
+
+    def test_get_subtree_is_a_copy(self, mock_config):
+        """Mutating a returned section leaves the config and index intact."""
+        config = get_config()
+        config.get("global")["language"] = "fr"
+        config.get("commands")["prompt"] = {}
+        assert config.get("global.language") == "en"
+        assert config.get("global")["language"] == "en"
+        assert config.get("commands.prompt.max_tokens") == mock_config["commands"]["prompt"]["max_tokens"]
+
+    def test_get_with_default_subtree_is_a_copy(self, temp_config_dir):
+        """Mutating a defaulted section does not touch DEFAULT_CONFIG."""
+        config = get_config()
+        config._config = {}
+        config.get_with_default("models.thresholds")["small_max_tokens"] = 1
+        assert DEFAULT_CONFIG["models"]["thresholds"]["small_max_tokens"] == 128000
+        assert config.get_with_default("models.thresholds.small_max_tokens") == 128000
+
+    def test_get_copies_non_json_values(self, mock_config):
+        """In-memory values are copied as-is, tuples and sets included."""
+        config = get_config()
+        config.get("version")
+        config._config = {"custom": {"pair": (1, 2), "tags": {"a"}}}
+        section = config.get("custom")
+        section["tags"].add("b")
+        assert section["pair"] == (1, 2)
+        assert config.get("custom") == {"pair": (1, 2), "tags": {"a"}}
+
+    def test_get_command_setting_returns_copy(self, mock_config):
+        """Mutable command settings are copied like get() sections."""
+        config = get_config()
+        config.set("commands.prompt.extra_paths", ["docs"])
+        config.get_command_setting("prompt", "extra_paths").append("src")
+        assert config.get_command_setting("prompt", "extra_paths") == ["docs"]
+
+    def test_get_sees_reassigned_config(self, mock_config):
+        """Replacing the loaded tree is picked up by the next lookup."""
+        config = get_config()
+        assert config.get("global.language") == "en"
+        config._config = {"global": {"language": "pt-br"}}
+        assert config.get("global.language") == "pt-br"
+        assert config.get("models.default") is None
+
 
 class TestAbConfigSet:
     """Tests for AbConfig.set() method."""
@@ -118,6 +180,107 @@ class TestAbConfigSet:
             saved = json.load(f)
         assert saved["models"]["default"] == "new/model"
 
+    def test_set_replaces_file_atomically(self, mock_config, temp_config_dir):
+        """Saving keeps the file mode and leaves no temporary file behind."""
+        from ab_cli.core import config as config_module
+
+        config_module.AB_CONFIG_FILE.chmod(0o640)
+        config = get_config()
+        config.set("global.language", "pt-br")
+
+        assert config_module.AB_CONFIG_FILE.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in config_module.AB_CONFIG_DIR.iterdir() if p.suffix == ".tmp"] == []
+
+    def test_set_keeps_symlinked_config(self, mock_config, temp_config_dir):
+        """A symlinked config.json stays a link; the target is rewritten."""
+        from ab_cli.core import config as config_module
+
+        dotfiles = temp_config_dir.parent / "dotfiles"
+        dotfiles.mkdir()
+        target = dotfiles / "config.json"
+        config_module.AB_CONFIG_FILE.replace(target)
+        config_module.AB_CONFIG_FILE.symlink_to(target)
+
+        config = get_config()
+        config.set("global.language", "pt-br")
+
+        assert config_module.AB_CONFIG_FILE.is_symlink()
+        assert json.loads(target.read_text())["global"]["language"] == "pt-br"
+        assert [p.name for p in dotfiles.iterdir()] == ["config.json"]
+
+    def test_set_creates_file_with_umask_mode(self, temp_config_dir):
+        """A new config file gets the umask default, not mkstemp's 0600."""
+        from ab_cli.core import config as config_module
+
+        umask = os.umask(0o022)
+        try:
+            get_config().set("global.language", "pt-br")
+        finally:
+            os.umask(umask)
+
+        assert config_module.AB_CONFIG_FILE.stat().st_mode & 0o777 == 0o644
+
+    def test_set_durable_fsyncs_before_replace(self, mock_config, temp_config_dir, monkeypatch):
+        """set_durable() makes saves fsync the temporary file."""
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd)))
+
+        config = get_config()
+        config.set("global.language", "pt-br")
+        assert synced == []
+
+        config.set_durable()
+        config.set("global.language", "es")
+        assert len(synced) == 1
+
+    def test_batch_defers_save_until_exit(self, mock_config, temp_config_dir, monkeypatch):
+        """set() calls inside batch() are written once, when the block exits."""
+        config = get_config()
+        saves = []
+        real_save = AbConfig._save
+        monkeypatch.setattr(AbConfig, "_save", lambda self: (saves.append(1), real_save(self)))
+
+        with config.batch():
+            config.set("global.language", "pt-br")
+            config.set("models.default", "new/model")
+            assert saves == []
+            assert config.get("global.language") == "pt-br"
+
+        assert saves == [1]
+        config.reload()
+        assert config.get("models.default") == "new/model"
+
+    def test_flush_without_changes_does_not_write(self, mock_config, temp_config_dir):
+        """flush() is a no-op when nothing is pending."""
+        from ab_cli.core import config as config_module
+
+        config = get_config()
+        config.get("global.language")
+        config_module.AB_CONFIG_FILE.unlink()
+        config.flush()
+        assert not config_module.AB_CONFIG_FILE.exists()
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib-json"])
+    def test_set_round_trips_with_either_json_backend(self, mock_config, temp_config_dir,
+                                                      monkeypatch, use_orjson):
+        """Saved config is indented UTF-8 JSON that reloads, with or without orjson."""
+        from ab_cli.core import config as config_module
+
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(config_module, "orjson", None)
+
+        config = get_config()
+        config.set("global.language", "pt-br ção")
+        config.reload()
+        assert config.get("global.language") == "pt-br ção"
+
+        text = config_module.AB_CONFIG_FILE.read_text(encoding="utf-8")
+        assert '\n  "global": {' in text
+        assert "ção" in text
+
 
 class TestAbConfigSelectModel:
     """Tests for AbConfig.select_model() method."""
@@ -150,6 +313,14 @@ class TestAbConfigSelectModel:
         # Now 60000 tokens should select medium
         assert config.select_model(60000) == "test/model-medium"
 
+    def test_select_model_inverted_thresholds(self, mock_config, temp_config_dir):
+        """A medium threshold below the small one never shadows the small tier."""
+        config = get_config()
+        config.set("models.thresholds.medium_max_tokens", 1000)
+
+        assert config.select_model(50000) == "test/model-small"
+        assert config.select_model(128001) == "test/model-large"
+
 
 class TestAbConfigCommandSettings:
     """Tests for AbConfig.get_command_setting() method."""
@@ -171,6 +342,16 @@ class TestAbConfigCommandSettings:
         config = get_config()
         assert config.get_command_setting("any-command", "nonexistent", "fallback") == "fallback"
 
+    def test_get_command_setting_follows_set(self, mock_config, temp_config_dir):
+        """Settings changed with set() are seen by the next lookup."""
+        config = get_config()
+        assert config.get_command_setting("pr-description", "language") == "en"
+
+        config.set("commands.pr-description.language", "es")
+        config.set("global.language", "fr")
+        assert config.get_command_setting("pr-description", "language") == "es"
+        assert config.get_command_setting("any-command", "language") == "fr"
+
 
 class TestAbConfigInit:
     """Tests for AbConfig.init_config() method."""
@@ -213,6 +394,40 @@ class TestAbConfigReload:
         config.reload()
         assert config.get("global.language") == "modified"
 
+    def test_unreachable_config_path_uses_defaults(self, temp_config_dir, monkeypatch):
+        """A config path blocked by a regular file counts as no config."""
+        from ab_cli.core import config as config_module
+
+        blocker = temp_config_dir / "not-a-dir"
+        blocker.write_text("")
+        monkeypatch.setattr(config_module, "AB_CONFIG_FILE", blocker / "config.json")
+
+        config = get_config()
+        assert config.get("global.language") == DEFAULT_CONFIG["global"]["language"]
+        config.reload()
+        assert config.get("models.default") == DEFAULT_CONFIG["models"]["default"]
+
+    def test_reload_skips_unchanged_file(self, mock_config, temp_config_dir, monkeypatch):
+        """An unchanged (not freshly written) file is not parsed again."""
+        from ab_cli.core import config as config_module
+
+        config_file = config_module.AB_CONFIG_FILE
+        os.utime(config_file, (1_000_000_000, 1_000_000_000))
+        config = get_config()
+        assert config.get("global.language") == "en"
+
+        parses = []
+        real_loads = config_module._loads_config
+        monkeypatch.setattr(config_module, "_loads_config", lambda raw: (parses.append(1), real_loads(raw))[1])
+        config.reload()
+        assert parses == []
+
+        # Same size, new mtime: must be re-read
+        config_file.write_text(config_file.read_text().replace('"en"', '"es"', 1))
+        config.reload()
+        assert parses == [1]
+        assert config.get("global.language") == "es"
+
 
 class TestAbConfigMisc:
     """Tests for miscellaneous AbConfig methods."""
@@ -225,6 +440,36 @@ class TestAbConfigMisc:
         result = config._deep_merge(base, override)
 
         assert result == {"a": {"b": 10, "c": 2, "d": 3}}
+        assert base == {"a": {"b": 1, "c": 2}}
+
+    def test_deep_merge_preserves_untouched_subtrees(self, temp_config_dir):
+        """Subtrees the override leaves alone are shared, not copied."""
+        config = get_config()
+        base = {"a": {"b": 1}, "c": {"d": 2}, "e": {"f": 3}}
+        result = config._deep_merge(base, {"a": {"b": 10}, "c": {}, "e": base["e"]})
+
+        assert result["c"] is base["c"]
+        assert result["e"] is base["e"]
+        assert result["a"] is not base["a"]
+        assert config._deep_merge(base, {}) is base
+
+    def test_deep_merge_in_place(self, temp_config_dir):
+        """_deep_merge(copy=False) updates base itself."""
+        config = get_config()
+        base = {"a": {"b": 1, "c": {"x": 1}}, "keep": [1]}
+        override = {"a": {"c": {"y": 2}}, "new": 5}
+        result = config._deep_merge(base, override, copy=False)
+
+        assert result is base
+        assert base == {"a": {"b": 1, "c": {"x": 1, "y": 2}}, "keep": [1], "new": 5}
+
+    @pytest.mark.parametrize("copy", [True, False], ids=["copy", "in-place"])
+    def test_deep_merge_keeps_none_values(self, temp_config_dir, copy):
+        """Override keys set to None are written even when base lacks them."""
+        config = get_config()
+        assert config._deep_merge({}, {"a": None}, copy=copy) == {"a": None}
+        assert config._deep_merge({"x": 1}, {"a": None}, copy=copy) == {"x": 1, "a": None}
+        assert config._deep_merge({"a": {"b": 1}}, {"a": {"c": None}}, copy=copy) == {"a": {"b": 1, "c": None}}
 
     def test_config_exists_true(self, mock_config):
         """config_exists() returns True when file exists."""
@@ -243,6 +488,14 @@ class TestAbConfigMisc:
         assert isinstance(history_dir, Path)
         assert "history" in str(history_dir)
 
+    def test_get_history_dir_cached_until_set(self, mock_config, temp_config_dir):
+        """The Path is reused between calls and rebuilt after set()."""
+        config = get_config()
+        assert config.get_history_dir() is config.get_history_dir()
+
+        config.set("history.directory", "~/other-history")
+        assert config.get_history_dir() == Path.home() / "other-history"
+
     def test_is_history_enabled(self, mock_config):
         """is_history_enabled returns config value."""
         config = get_config()
@@ -256,6 +509,16 @@ class TestAbConfigMisc:
         assert "version" in data
         assert "global" in data
 
+    def test_to_dict_returns_independent_copies(self, mock_config, temp_config_dir):
+        """to_dict results can be mutated freely and follow set()."""
+        config = get_config()
+        data = config.to_dict()
+        data["global"]["language"] = "mutated"
+        assert config.to_dict()["global"]["language"] == "en"
+
+        config.set("global.language", "pt-br")
+        assert config.to_dict()["global"]["language"] == "pt-br"
+
     def test_get_config_path(self, temp_config_dir):
         """get_config_path returns correct path."""
         from ab_cli.core import config as config_module
@@ -280,6 +543,23 @@ class TestAbConfigMisc:
         assert settings["reasoning_effort"] == "medium"
         assert settings["service_tier"] == "default"
 
+    def test_get_api_key_snapshot_and_refresh(self, temp_config_dir, monkeypatch):
+        """get_api_key reads the environment once until refresh_env()."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "first-key")
+        config = get_config()
+        assert config.get_api_key() == "first-key"
+
+        monkeypatch.setenv("OPENROUTER_API_KEY", "second-key")
+        assert config.get_api_key() == "first-key"
+
+        config.refresh_env()
+        assert config.get_api_key() == "second-key"
+
+    def test_get_api_key_missing(self, temp_config_dir, monkeypatch):
+        """get_api_key returns None for an unset variable."""
+        monkeypatch.delenv("CUSTOM_KEY_ENV", raising=False)
+        assert get_config().get_api_key("CUSTOM_KEY_ENV") is None
+
 
 class TestEstimateTokens:
     """Tests for estimate_tokens function."""
@@ -297,6 +577,12 @@ class TestEstimateTokens:
         """estimate_tokens handles short text."""
         assert estimate_tokens("hi") == 0  # 2 // 4 = 0
 
+    def test_estimate_tokens_batch_matches_concatenation(self):
+        """estimate_tokens_batch equals estimate_tokens of the joined texts."""
+        texts = ["ab", "c" * 7, "", "d" * 10]
+        assert estimate_tokens_batch(texts) == estimate_tokens("".join(texts))
+        assert estimate_tokens_batch([]) == 0
+
 
 class TestConvenienceFunctions:
     """Tests for convenience functions."""
@@ -403,6 +689,26 @@ class TestPydanticModels:
         assert isinstance(model.commands, dict)
         assert isinstance(model.history, HistoryConfigModel)
 
+    def test_default_config_values(self):
+        """DEFAULT_CONFIG carries defaults beyond the validation model's."""
+        assert DEFAULT_CONFIG["global"]["reasoning_effort"] == "medium"
+        assert DEFAULT_CONFIG["commands"]["prompt"]["max_tokens"] == 900000
+        assert DEFAULT_CONFIG["history"]["directory"].endswith("history")
+        assert AbConfigModel().model_dump(by_alias=True) != DEFAULT_CONFIG
+
+    def test_load_does_not_inject_defaults(self, temp_config_dir):
+        """Loading a partial file keeps the validation model's defaults."""
+        from ab_cli.core import config as config_module
+
+        with open(config_module.AB_CONFIG_FILE, "w") as f:
+            json.dump({"version": "1.0", "global": {"language": "fr"}}, f)
+
+        config = get_config()
+        assert config.get("global.language") == "fr"
+        assert config.get("commands") == {}
+        assert config.get("history.directory") == ""
+        assert config.get("global.reasoning_effort") is None
+
     def test_ab_config_model_alias(self):
         """AbConfigModel uses 'global' alias correctly."""
         data = {
@@ -486,6 +792,8 @@ class TestConfigValidation:
         with pytest.raises(ConfigValidationError) as exc_info:
             config.validate(invalid_data)
         assert len(exc_info.value.errors) > 0
+        assert str(exc_info.value).startswith("Configuration validation failed: ")
+        assert "timeout_seconds" in str(exc_info.value)
 
     def test_get_validated_model(self, mock_config):
         """get_validated_model returns cached model."""
@@ -493,6 +801,17 @@ class TestConfigValidation:
         model = config.get_validated_model()
         assert isinstance(model, AbConfigModel)
 
+    def test_get_validated_model_is_cached_until_set(self, mock_config, temp_config_dir):
+        """The model is reused between calls and rebuilt after set()."""
+        config = get_config()
+        model = config.get_validated_model()
+        assert config.get_validated_model() is model
+
+        config.set("global.language", "es")
+        new_model = config.get_validated_model()
+        assert new_model is not model
+        assert new_model.global_settings.language == "es"
+
     def test_get_validation_errors_empty_on_valid(self, mock_config):
         """get_validation_errors returns empty list for valid config."""
         config = get_config()
@@ -566,13 +885,18 @@ class TestConfigValidationError:
         error = ConfigValidationError("Test error")
         assert str(error) == "Test error"
 
-    def test_error_has_errors_list(self):
-        """ConfigValidationError stores errors list."""
+    def test_error_has_errors_tuple(self):
+        """ConfigValidationError stores a list of errors as a tuple."""
         errors = [{"loc": ("field",), "msg": "error"}]
         error = ConfigValidationError("Test error", errors=errors)
-        assert error.errors == errors
+        assert error.errors == tuple(errors)
 
-    def test_error_default_empty_list(self):
-        """ConfigValidationError defaults to empty errors list."""
+    def test_error_default_empty_tuple(self):
+        """ConfigValidationError defaults to empty errors tuple."""
         error = ConfigValidationError("Test error")
-        assert error.errors == []
+        assert error.errors == ()
+
+    def test_error_renders_detail_in_str(self):
+        """The detail object is appended to the message when stringified."""
+        error = ConfigValidationError("Test error", detail="bad field")
+        assert str(error) == "Test error: bad field"
@@ -2,12 +2,17 @@
 import subprocess
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from ab_cli.utils.git_helpers import (
     get_commit_diff,
+    get_conflicted_files,
     get_staged_diff_for_files,
     get_staged_name_status_for_files,
     get_staged_text_files,
+    is_git_repo,
     push_branch,
+    run_git,
 )
 
 
@@ -81,6 +86,61 @@ class TestRunGit:
         assert "résumé" in diff
         assert "naïve" in diff
 
+    def test_run_git_output_has_no_color_codes(self, mock_git_repo, monkeypatch):
+        """Captured output stays plain even when the repo forces color on."""
+        monkeypatch.chdir(mock_git_repo)
+        subprocess.run(["git", "config", "color.ui", "always"], cwd=mock_git_repo, check=True)
+
+        assert "\x1b[" not in run_git('log', '-1', '--oneline').stdout
+        assert "\x1b[" not in get_commit_diff("HEAD")
+
+    def test_run_git_error_carries_decoded_stderr(self, mock_git_repo, monkeypatch):
+        """A failing command raises CalledProcessError with text stderr."""
+        monkeypatch.chdir(mock_git_repo)
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_git('rev-parse', '--verify', 'no-such-branch')
+        assert isinstance(exc_info.value.stderr, str)
+        assert exc_info.value.returncode != 0
+
+
+class TestIsGitRepo:
+    """Tests for is_git_repo caching."""
+
+    def test_is_git_repo_cached_per_cwd(self, mock_git_repo, tmp_path, monkeypatch):
+        """Spawns git once per directory and keeps answers separate."""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        with patch("ab_cli.utils.git_helpers.run_git") as mock_run:
+            monkeypatch.chdir(mock_git_repo)
+            assert is_git_repo() is True
+            assert is_git_repo() is True
+            assert mock_run.call_count == 1
+
+            mock_run.side_effect = subprocess.CalledProcessError(128, "git")
+            monkeypatch.chdir(outside)
+            assert is_git_repo() is False
+            assert mock_run.call_count == 2
+
+    def test_is_git_repo_rechecks_after_negative(self, tmp_path, monkeypatch):
+        """A directory that becomes a repository is seen on the next check."""
+        monkeypatch.chdir(tmp_path)
+        assert is_git_repo() is False
+
+        subprocess.run(["git", "init", "-q"], check=True)
+        assert is_git_repo() is True
+
+
+class TestGetConflictedFiles:
+    """Tests for get_conflicted_files function."""
+
+    def test_lists_each_path_once_from_subdirectory(self, mock_conflicted_git_repo, monkeypatch):
+        """Unmerged stages collapse to one root-relative path, from any cwd."""
+        subdir = mock_conflicted_git_repo / "sub"
+        subdir.mkdir()
+        monkeypatch.chdir(subdir)
+        assert get_conflicted_files() == ["test.txt"]
+
 
 class TestStagedTextFiles:
     """Tests for staged text file filtering."""
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 """Unit tests for prompt_builder utilities."""
+import pytest
+
+from ab_cli import utils
 from ab_cli.utils.prompt_builder import (
     build_generation_prompt,
     clean_llm_response,
@@ -8,17 +11,31 @@ from ab_cli.utils.prompt_builder import (
 )
 
 
+# build_generation_prompt inputs, keyed by the label the tests use
+PROMPT_CASES = {
+    "basic": dict(content="test content", rules=["Rule 1", "Rule 2"], lang="en", task_description="Test task"),
+    "lang_added": dict(content="test", rules=["Some rule"], lang="pt-br", task_description="Task"),
+    "lang_dup": dict(content="test", rules=["Write in language: en"], lang="en", task_description="Task"),
+    "with_examples": dict(content="test", rules=["Rule"], lang="en", task_description="Task",
+                          examples=["Example 1", "Example 2"]),
+    "custom_instr": dict(content="test", rules=["Rule"], lang="en", task_description="Task",
+                         response_instruction="Return ONLY the branch name:"),
+    "empty_rules": dict(content="test", rules=[], lang="en", task_description="Task"),
+}
+
+
+@pytest.fixture(scope="module")
+def prompts():
+    """Each PROMPT_CASES prompt, built once per module (the builder is pure)."""
+    return {label: build_generation_prompt(**kwargs) for label, kwargs in PROMPT_CASES.items()}
+
+
 class TestBuildGenerationPrompt:
     """Tests for build_generation_prompt function."""
 
-    def test_basic_prompt_structure(self):
+    def test_basic_prompt_structure(self, prompts):
         """Test that prompt has basic required structure."""
-        result = build_generation_prompt(
-            content="test content",
-            rules=["Rule 1", "Rule 2"],
-            lang="en",
-            task_description="Test task",
-        )
+        result = prompts["basic"]
         assert "Test task" in result
         assert "RULES:" in result
         assert "1. Rule 1" in result
@@ -26,59 +43,29 @@ class TestBuildGenerationPrompt:
         assert "CONTENT:" in result
         assert "test content" in result
 
-    def test_language_added_when_not_in_rules(self):
+    def test_language_added_when_not_in_rules(self, prompts):
         """Test that language is added when not mentioned in rules."""
-        result = build_generation_prompt(
-            content="test",
-            rules=["Some rule"],
-            lang="pt-br",
-            task_description="Task",
-        )
-        assert "OUTPUT LANGUAGE: pt-br" in result
-
-    def test_language_not_duplicated_if_in_rules(self):
+        assert "OUTPUT LANGUAGE: pt-br" in prompts["lang_added"]
+
+    def test_language_not_duplicated_if_in_rules(self, prompts):
         """Test that language is not duplicated if mentioned in rules."""
-        result = build_generation_prompt(
-            content="test",
-            rules=["Write in language: en"],
-            lang="en",
-            task_description="Task",
-        )
         # Should only appear once (in the rule)
-        assert result.count("language") == 1
+        assert prompts["lang_dup"].count("language") == 1
 
-    def test_examples_section_added(self):
+    def test_examples_section_added(self, prompts):
         """Test that examples are added when provided."""
-        result = build_generation_prompt(
-            content="test",
-            rules=["Rule"],
-            lang="en",
-            task_description="Task",
-            examples=["Example 1", "Example 2"],
-        )
+        result = prompts["with_examples"]
         assert "EXAMPLES:" in result
         assert "Example 1" in result
         assert "Example 2" in result
 
-    def test_custom_response_instruction(self):
+    def test_custom_response_instruction(self, prompts):
         """Test custom response instruction."""
-        result = build_generation_prompt(
-            content="test",
-            rules=["Rule"],
-            lang="en",
-            task_description="Task",
-            response_instruction="Return ONLY the branch name:",
-        )
-        assert "Return ONLY the branch name:" in result
-
-    def test_empty_rules_list(self):
+        assert "Return ONLY the branch name:" in prompts["custom_instr"]
+
+    def test_empty_rules_list(self, prompts):
         """Test with empty rules list."""
-        result = build_generation_prompt(
-            content="test",
-            rules=[],
-            lang="en",
-            task_description="Task",
-        )
+        result = prompts["empty_rules"]
         assert "RULES:" not in result
         assert "CONTENT:" in result
 
@@ -86,74 +73,30 @@ class TestBuildGenerationPrompt:
 class TestCleanLlmResponse:
     """Tests for clean_llm_response function."""
 
-    def test_strips_whitespace(self):
-        """Test that response is stripped of whitespace."""
-        result = clean_llm_response("  hello world  ")
-        assert result == "hello world"
-
-    def test_strips_quotes_single(self):
-        """Test stripping single quotes."""
-        result = clean_llm_response("'feature/add-login'", strip_quotes=True)
-        assert result == "feature/add-login"
-
-    def test_strips_quotes_double(self):
-        """Test stripping double quotes."""
-        result = clean_llm_response('"feature/add-login"', strip_quotes=True)
-        assert result == "feature/add-login"
-
-    def test_strips_backticks(self):
-        """Test stripping backticks."""
-        result = clean_llm_response("`feature/add-login`", strip_quotes=True)
-        assert result == "feature/add-login"
-
-    def test_max_lines_single(self):
-        """Test limiting to single line."""
-        result = clean_llm_response("line1\nline2\nline3", max_lines=1)
-        assert result == "line1"
-
-    def test_max_lines_multiple(self):
-        """Test limiting to multiple lines."""
-        result = clean_llm_response("line1\nline2\nline3", max_lines=2)
-        assert result == "line1\nline2"
-
-    def test_max_lines_zero_means_unlimited(self):
-        """Test that max_lines=0 means unlimited."""
-        result = clean_llm_response("line1\nline2\nline3", max_lines=0)
-        assert result == "line1\nline2\nline3"
-
-    def test_max_length_truncates(self):
-        """Test max length truncation."""
-        result = clean_llm_response("hello world", max_length=5)
-        assert result == "hello"
-
-    def test_max_length_with_trim_char(self):
-        """Test max length with trim character."""
-        result = clean_llm_response("feature-add-login-", max_length=15, trim_char="-")
-        assert result == "feature-add-log"
-        assert not result.endswith("-")
-
-    def test_empty_response(self):
-        """Test with empty response."""
-        result = clean_llm_response("")
-        assert result == ""
-
-    def test_none_response_handled(self):
-        """Test handling of None-like falsy response."""
-        result = clean_llm_response("")
-        assert result == ""
-
-    def test_strip_code_fences(self):
-        """Test stripping markdown code fences."""
-        result = clean_llm_response(
-            "```python\nprint('hello')\n```",
-            strip_code_fences=True
-        )
-        assert result == "print('hello')"
-
-    def test_strip_code_fences_preserves_content(self):
-        """Test that non-fenced content is preserved."""
-        result = clean_llm_response("normal text", strip_code_fences=True)
-        assert result == "normal text"
+    @pytest.mark.parametrize("kwargs,expected", [
+        pytest.param({"response": "  hello world  "}, "hello world", id="strips-whitespace"),
+        pytest.param({"response": "'feature/add-login'", "strip_quotes": True}, "feature/add-login",
+                     id="strips-single-quotes"),
+        pytest.param({"response": '"feature/add-login"', "strip_quotes": True}, "feature/add-login",
+                     id="strips-double-quotes"),
+        pytest.param({"response": "`feature/add-login`", "strip_quotes": True}, "feature/add-login",
+                     id="strips-backticks"),
+        pytest.param({"response": "line1\nline2\nline3", "max_lines": 1}, "line1", id="max-lines-single"),
+        pytest.param({"response": "line1\nline2\nline3", "max_lines": 2}, "line1\nline2", id="max-lines-multiple"),
+        pytest.param({"response": "line1\nline2\nline3", "max_lines": 0}, "line1\nline2\nline3",
+                     id="max-lines-zero-unlimited"),
+        pytest.param({"response": "hello world", "max_length": 5}, "hello", id="max-length-truncates"),
+        pytest.param({"response": "feature-add-login-", "max_length": 15, "trim_char": "-"}, "feature-add-log",
+                     id="max-length-with-trim-char"),
+        pytest.param({"response": ""}, "", id="empty"),
+        pytest.param({"response": "```python\nprint('hello')\n```", "strip_code_fences": True}, "print('hello')",
+                     id="strips-code-fences"),
+        pytest.param({"response": "normal text", "strip_code_fences": True}, "normal text",
+                     id="code-fences-preserve-plain-text"),
+    ])
+    def test_clean_llm_response(self, kwargs, expected):
+        """clean_llm_response applies each cleanup option."""
+        assert clean_llm_response(**kwargs) == expected
 
 
 class TestNormalizeIdentifier:
@@ -209,55 +152,30 @@ class TestNormalizeIdentifier:
 class TestStripMarkdownCodeBlock:
     """Tests for strip_markdown_code_block function."""
 
-    def test_strips_fenced_code_block(self):
-        """Test stripping fenced code block."""
-        result = strip_markdown_code_block("```python\nprint('hello')\n```")
-        assert result == "print('hello')"
-
-    def test_strips_fenced_code_block_no_language(self):
-        """Test stripping fenced code block without language."""
-        result = strip_markdown_code_block("```\ncode here\n```")
-        assert result == "code here"
-
-    def test_strips_inline_code(self):
-        """Test stripping inline code."""
-        result = strip_markdown_code_block("`inline code`")
-        assert result == "inline code"
-
-    def test_preserves_plain_text(self):
-        """Test that plain text is preserved."""
-        result = strip_markdown_code_block("plain text")
-        assert result == "plain text"
-
-    def test_empty_input(self):
-        """Test with empty input."""
-        result = strip_markdown_code_block("")
-        assert result == ""
-
-    def test_multiline_code_block(self):
-        """Test multiline code block."""
-        code = "```bash\necho 'line 1'\necho 'line 2'\necho 'line 3'\n```"
-        result = strip_markdown_code_block(code)
-        assert result == "echo 'line 1'\necho 'line 2'\necho 'line 3'"
-
-    def test_code_block_with_leading_whitespace(self):
-        """Test code block with leading whitespace."""
-        result = strip_markdown_code_block("  ```python\ncode\n```")
-        assert result == "code"
+    @pytest.mark.parametrize("text,expected", [
+        pytest.param("```python\nprint('hello')\n```", "print('hello')", id="fenced"),
+        pytest.param("```\ncode here\n```", "code here", id="fenced-no-language"),
+        pytest.param("`inline code`", "inline code", id="inline"),
+        pytest.param("plain text", "plain text", id="plain-text"),
+        pytest.param("", "", id="empty"),
+        pytest.param("```bash\necho 'line 1'\necho 'line 2'\necho 'line 3'\n```",
+                     "echo 'line 1'\necho 'line 2'\necho 'line 3'", id="multiline"),
+        pytest.param("  ```python\ncode\n```", "code", id="leading-whitespace"),
+    ])
+    def test_strip_markdown_code_block(self, text, expected):
+        """strip_markdown_code_block unwraps fenced and inline code."""
+        assert strip_markdown_code_block(text) == expected
 
 
 class TestUtilsModuleExports:
     """Tests for utils module exports."""
 
-    def test_prompt_builder_functions_exported_from_utils(self):
-        """Test that prompt builder functions are exported from utils."""
-        from ab_cli.utils import (
-            build_generation_prompt,
-            clean_llm_response,
-            normalize_identifier,
-            strip_markdown_code_block,
-        )
-        assert callable(build_generation_prompt)
-        assert callable(clean_llm_response)
-        assert callable(normalize_identifier)
-        assert callable(strip_markdown_code_block)
+    @pytest.mark.parametrize("func", [
+        build_generation_prompt,
+        clean_llm_response,
+        normalize_identifier,
+        strip_markdown_code_block,
+    ], ids=lambda func: func.__name__)
+    def test_prompt_builder_functions_exported_from_utils(self, func):
+        """ab_cli.utils re-exports the prompt builder functions."""
+        assert getattr(utils, func.__name__) is func